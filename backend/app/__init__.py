@@ -5,6 +5,11 @@ Educational Note: The application factory pattern allows us to create
 multiple app instances with different configurations (dev, test, prod).
 This is a Flask best practice for larger applications.
 """
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
 from flask import Flask
 from flask_cors import CORS
 from flask_socketio import SocketIO
@@ -14,6 +19,9 @@ from config import config
 # Initialize extensions globally but without app context
 socketio = SocketIO(cors_allowed_origins="*")
 
+# Background listener that writes queued log records (started once)
+_log_listener = None
+
 
 def create_app(config_name='development'):
     """
@@ -31,6 +39,9 @@ def create_app(config_name='development'):
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
 
+    # Set up logging before anything logs through app.logger
+    configure_logging(app)
+
     # Ensure base directories exist before any routes access them
     from app.utils.path_utils import ensure_base_directories
     ensure_base_directories()
@@ -52,6 +63,37 @@ def create_app(config_name='development'):
     return app
 
 
+def configure_logging(app):
+    """
+    Route the backend's loggers through a queue drained by a background thread.
+
+    Educational Note: Module loggers (logging.getLogger(__name__)) all sit
+    under the "app" logger, as does Flask's app.logger. With a QueueHandler
+    attached there, a log call on a request or agent thread only enqueues the
+    record; the QueueListener thread does the actual stream write, so a slow
+    or contended stdout never stalls tool execution.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
+    )
+
+    _log_listener = QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
 def register_error_handlers(app):
     """
     Register global error handlers for the application.
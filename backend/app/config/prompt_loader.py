@@ -23,11 +23,24 @@ Prompt Hierarchy:
 2. Global default prompt (fallback)
 """
 import json
+import re
 from pathlib import Path
+from string import Template
 from typing import Optional, Dict, Any
 
 from config import Config
 
+# "{{", "}}" or a "{name}" placeholder, matched in one left-to-right pass so
+# an escaped brace is never mistaken for the start of a placeholder
+_FORMAT_FIELD_RE = re.compile(r"\{\{|\}\}|\{(\w+)\}")
+
+
+def _format_field_to_template(match: "re.Match[str]") -> str:
+    """Convert one str.format token to its string.Template equivalent."""
+    if match.group(1) is not None:
+        return "${" + match.group(1) + "}"
+    return match.group(0)[0]
+
 
 class PromptLoader:
     """
@@ -253,6 +266,25 @@ class PromptLoader:
         except (FileNotFoundError, json.JSONDecodeError):
             return None
 
+    def compile_message_template(self, template: str) -> Template:
+        """
+        Compile a str.format-style message template into a string.Template.
+
+        Educational Note: Prompt files write placeholders as {name}. Calling
+        .format() re-parses the whole template on every request; compiling it
+        once lets callers just .substitute() values. Literal "$" characters are
+        escaped first so they survive the conversion, and "{{" / "}}" become
+        literal braces just as they would with .format().
+
+        Args:
+            template: Template text with {name} placeholders
+
+        Returns:
+            string.Template using ${name} placeholders
+        """
+        escaped = template.replace("$", "$$")
+        return Template(_FORMAT_FIELD_RE.sub(_format_field_to_template, escaped))
+
     def list_all_prompts(self) -> list[Dict[str, Any]]:
         """
         List all prompt configurations from the prompts directory.
@@ -35,8 +35,21 @@ class ComponentAgentService:
         return self._prompt_config
 
     def _load_tools(self) -> List[Dict[str, Any]]:
+        """
+        Load the agent's tools for the configured workflow.
+
+        Educational Note: With merge_plan_write enabled, Claude only sees
+        plan_and_write_components and produces plan + code in one turn,
+        saving a full round-trip per job. Otherwise it gets the classic
+        plan_components -> write_component_code pair.
+        """
         if self._tools is None:
-            self._tools = tool_loader.load_tools_for_agent(self.AGENT_NAME)
+            all_tools = tool_loader.load_tools_for_agent(self.AGENT_NAME)["all_tools"]
+            merged = self._load_config().get("merge_plan_write", False)
+            self._tools = [
+                tool for tool in all_tools
+                if (tool["name"] == component_tool_executor.MERGED_TOOL) == merged
+            ]
         return self._tools
 
     def generate_components(
@@ -72,6 +85,10 @@ class ComponentAgentService:
 
         messages = [{"role": "user", "content": user_message}]
 
+        system_prompt = config["system_prompt"]
+        if config.get("merge_plan_write", False):
+            system_prompt = f"{system_prompt}\n\n{config['merged_workflow_prompt']}"
+
         total_input_tokens = 0
         total_output_tokens = 0
 
@@ -82,7 +99,7 @@ class ComponentAgentService:
 
             response = claude_service.send_message(
                 messages=messages,
-                system_prompt=config["system_prompt"],
+                system_prompt=system_prompt,
                 model=config["model"],
                 max_tokens=config["max_tokens"],
                 temperature=config["temperature"],
@@ -101,13 +118,11 @@ class ComponentAgentService:
             # Process tool calls
             tool_results = []
 
-            for block in content_blocks:
-                block_type = getattr(block, "type", None) if hasattr(block, "type") else block.get("type")
-
-                if block_type == "tool_use":
-                    tool_name = getattr(block, "name", "") if hasattr(block, "name") else block.get("name", "")
-                    tool_input = getattr(block, "input", {}) if hasattr(block, "input") else block.get("input", {})
-                    tool_id = getattr(block, "id", "") if hasattr(block, "id") else block.get("id", "")
+            for block in map(claude_parsing_utils.block_to_dict, content_blocks):
+                if block.get("type") == "tool_use":
+                    tool_name = block.get("name", "")
+                    tool_input = block.get("input", {})
+                    tool_id = block.get("id", "")
 
                     print(f"    Tool: {tool_name}")
 
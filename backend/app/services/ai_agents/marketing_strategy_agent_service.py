@@ -7,17 +7,30 @@ Orchestrates the marketing strategy generation workflow:
 3. Agent signals completion via is_last_section=true flag
 """
 
+import asyncio
+import hashlib
+import json
+import time
 import uuid
-from typing import Dict, Any, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
+from pathlib import Path
 
 from app.services.integrations.claude import claude_service
 from app.config import prompt_loader, tool_loader
 from app.utils import claude_parsing_utils
 from app.utils.source_content_utils import get_source_content
+from app.utils.rate_limit_utils import RateLimiter
+from app.utils.path_utils import get_studio_dir
 from app.services.data_services import message_service
 from app.services.studio_services import studio_index_service
-from app.services.tool_executors.marketing_strategy_tool_executor import marketing_strategy_tool_executor
+from app.services.background_services.persist_executor import persist_in_background
+from app.services.tool_executors.marketing_strategy_tool_executor import (
+    marketing_strategy_tool_executor,
+    job_update_coalescer
+)
 
 
 class MarketingStrategyAgentService:
@@ -26,13 +39,20 @@ class MarketingStrategyAgentService:
     AGENT_NAME = "marketing_strategy_agent"
     MAX_ITERATIONS = 10
 
+    # Stop early if this many consecutive iterations write no new sections
+    MAX_STALLED_ITERATIONS = 2
+
     def __init__(self):
         self._prompt_config = None
+        self._user_message_template = None
         self._tools = None
 
     def _load_config(self) -> Dict[str, Any]:
         if self._prompt_config is None:
             self._prompt_config = prompt_loader.get_prompt_config("marketing_strategy_agent")
+            self._user_message_template = prompt_loader.compile_message_template(
+                self._prompt_config.get("user_message", "")
+            )
         return self._prompt_config
 
     def _load_tools(self) -> List[Dict[str, Any]]:
@@ -45,9 +65,70 @@ class MarketingStrategyAgentService:
         project_id: str,
         source_id: str,
         job_id: str,
-        direction: str = ""
+        direction: str = "",
+        rate_limiter: Optional[RateLimiter] = None
     ) -> Dict[str, Any]:
-        """Run the agent to generate a marketing strategy document."""
+        """
+        Run the agent to generate a marketing strategy document.
+
+        Args:
+            project_id: The project UUID
+            source_id: The source UUID
+            job_id: The job ID for status tracking
+            direction: User's direction for the strategy
+            rate_limiter: Optional limiter shared across concurrent jobs;
+                waited on before every Claude call
+        """
+        # Educational Note: One context dict lives for the whole run and is
+        # passed to every tool call. The executor keeps per-run state on it -
+        # the section counter and the buffered markdown - so it must not be
+        # copied per call. Tools only run on the serial lane or the main thread
+        # (after the lane drains), so it is never mutated concurrently.
+        # The output path is built here once instead of per section.
+        marketing_strategy_path = Path(get_studio_dir(project_id)) / "marketing_strategies" / f"{job_id}.md"
+
+        context: Dict[str, Any] = {
+            "project_id": project_id,
+            "job_id": job_id,
+            "source_id": source_id,
+            "marketing_strategy_path": marketing_strategy_path,
+            "sections_written": 0,
+            "iterations": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "pending_sections": []
+        }
+
+        # This runs as a fire-and-forget background task, so an exception
+        # escaping here would leave the job stuck in "processing" forever
+        try:
+            return self._run_agent(context, direction, rate_limiter)
+        except Exception as e:
+            error_message = f"Marketing strategy generation failed: {e}"
+            print(f"[MarketingStrategyAgent] {error_message}")
+            marketing_strategy_tool_executor.close_run(context, error_message=error_message)
+            return {
+                "success": False,
+                "error_message": error_message,
+                "iterations": context["iterations"],
+                "sections_written": context["sections_written"],
+                "usage": {
+                    "input_tokens": context["input_tokens"],
+                    "output_tokens": context["output_tokens"]
+                }
+            }
+
+    def _run_agent(
+        self,
+        context: Dict[str, Any],
+        direction: str,
+        rate_limiter: Optional[RateLimiter]
+    ) -> Dict[str, Any]:
+        """Run the agent loop for one job (see generate_marketing_strategy)."""
+        project_id = context["project_id"]
+        source_id = context["source_id"]
+        job_id = context["job_id"]
+
         config = self._load_config()
         tools = self._load_tools()
 
@@ -67,114 +148,370 @@ class MarketingStrategyAgentService:
 
         # Build user message from config
         effective_direction = direction if direction else config.get("default_direction", "")
-        user_message = config.get("user_message", "").format(
+        user_message = self._user_message_template.substitute(
             source_content=source_content,
             direction=effective_direction
         )
 
-        messages = [{"role": "user", "content": user_message}]
+        # Conversation grows by one assistant + one tool_result message per
+        # iteration. maxlen covers the initial prompt plus every iteration, so
+        # nothing is ever evicted; it is converted to a list at send time.
+        # Educational Note: Every iteration resends the system prompt and the
+        # source-heavy first user message. Marking both with cache_control lets
+        # Anthropic's prompt cache serve that stable prefix on later iterations
+        # (cheaper and faster) instead of re-processing it. New turns are only
+        # ever appended, so the prefix stays byte-identical.
+        system_prompt = [{"type": "text", "text": config["system_prompt"], "cache_control": {"type": "ephemeral"}}]
+        messages = deque(
+            [{
+                "role": "user",
+                "content": [{"type": "text", "text": user_message, "cache_control": {"type": "ephemeral"}}]
+            }],
+            maxlen=1 + 2 * self.MAX_ITERATIONS
+        )
 
         total_input_tokens = 0
         total_output_tokens = 0
+        total_cache_creation_tokens = 0
+        total_cache_read_tokens = 0
         sections_written = 0
 
+        # Educational Note: MAX_ITERATIONS alone lets a stuck agent (re-planning,
+        # repeating itself) burn every iteration. Two cheaper guards bail out
+        # first: no new sections for MAX_STALLED_ITERATIONS iterations in a row,
+        # or a single iteration running past its wall-clock budget.
+        iteration_timeout_s = config.get("iteration_timeout_s", 60)
+        last_progress_iteration = 0
+        error_message = f"Agent reached maximum iterations ({self.MAX_ITERATIONS})"
+
+        # Output directory is created once per run instead of per section
+        context["marketing_strategy_path"].parent.mkdir(parents=True, exist_ok=True)
+
+        # Hashes of write_marketing_section inputs already executed this run.
+        # The model sometimes re-emits an identical section on a later turn;
+        # re-running it would duplicate the markdown and inflate the count.
+        seen_inputs: set = set()
+
         print(f"[MarketingStrategyAgent] Starting (job_id: {job_id[:8]})")
 
         for iteration in range(1, self.MAX_ITERATIONS + 1):
             print(f"  Iteration {iteration}/{self.MAX_ITERATIONS}")
-
-            response = claude_service.send_message(
-                messages=messages,
-                system_prompt=config["system_prompt"],
-                model=config["model"],
-                max_tokens=config["max_tokens"],
-                temperature=config["temperature"],
-                tools=tools["all_tools"] if isinstance(tools, dict) else tools,
-                tool_choice={"type": "any"},
-                project_id=project_id
-            )
-
-            total_input_tokens += response["usage"]["input_tokens"]
-            total_output_tokens += response["usage"]["output_tokens"]
+            sections_before = sections_written
+            planned_before = "document_title" in context
+            timed_out = False
+            context["iterations"] = iteration
+
+            tool_calls: List[Dict[str, Any]] = []
+            terminations: List[Dict[str, Any]] = []
+            futures = {}
+            # Results decided without running a tool (duplicates, cut-off inputs)
+            local_results: Dict[str, Dict[str, Any]] = {}
+            # Batch call id -> number of duplicate sections dropped from it
+            skipped_duplicates: Dict[str, int] = {}
+            incremental_blocks: Dict[int, Dict[str, Any]] = {}
+            response = None
+
+            # Educational Note: We stream the response and dispatch each tool call
+            # as soon as its tool_use block is complete, so tool I/O overlaps with
+            # Claude still generating the rest of the response.
+            # - Every tool updates studio_index.json and appends to the markdown
+            #   file in the order Claude wrote the sections, so calls run one at a
+            #   time on a single-worker lane, in emitted order
+            # - The terminating call runs last, after every other call finished
+            if rate_limiter:
+                rate_limiter.wait_if_needed()
+
+            # The budget covers the Claude call and tools only, not time spent
+            # throttled by the rate limiter
+            iteration_deadline = time.monotonic() + iteration_timeout_s
+
+            with ThreadPoolExecutor(max_workers=1) as serial_lane:
+                for event in claude_service.stream_message(
+                    messages=list(messages),
+                    system_prompt=system_prompt,
+                    model=config["model"],
+                    max_tokens=config["max_tokens"],
+                    temperature=config["temperature"],
+                    tools=tools["all_tools"] if isinstance(tools, dict) else tools,
+                    tool_choice={"type": "any"},
+                    project_id=project_id
+                ):
+                    if time.monotonic() > iteration_deadline:
+                        # Leaving the loop closes the stream, stopping generation
+                        timed_out = True
+                        break
+
+                    event_type = event["type"]
+
+                    if event_type == "content_block_start":
+                        block = dict(event["content_block"], json_parts=[])
+                        incremental_blocks[event["index"]] = block
+
+                        if block["type"] == "tool_use":
+                            # Same debounced writer as the tools, so it never races their index writes
+                            job_update_coalescer.schedule(
+                                project_id, job_id,
+                                status_message="Streaming response from Claude..."
+                            )
+
+                    elif event_type == "input_json_delta":
+                        incremental_blocks[event["index"]]["json_parts"].append(event["partial_json"])
+
+                    elif event_type == "content_block_stop":
+                        block = incremental_blocks.pop(event["index"])
+                        if block["type"] != "tool_use":
+                            continue
+
+                        call = {"id": block["id"], "name": block["name"], "input": {}}
+                        tool_calls.append(call)
+
+                        try:
+                            call["input"] = json.loads("".join(block["json_parts"]) or "{}")
+                        except json.JSONDecodeError:
+                            # Block was cut off mid-input (usually max_tokens) - don't
+                            # run it, tell Claude so it can resend a smaller call
+                            print(f"    Incomplete input for {call['name']}, skipping")
+                            local_results[call["id"]] = {
+                                "success": False,
+                                "message": (
+                                    "Tool input was cut off before it was complete (response hit "
+                                    "max_tokens) and was not executed. Send this call again with "
+                                    "less content, e.g. fewer sections per batch."
+                                )
+                            }
+                            continue
+
+                        if call["name"] == "write_marketing_section":
+                            input_key = self._input_key(call["input"])
+                            if input_key in seen_inputs:
+                                print(f"    Skipping duplicate: {call['name']}")
+                                local_results[call["id"]] = {
+                                    "success": True,
+                                    "message": "Section already written - skipped duplicate"
+                                }
+                                continue
+                            seen_inputs.add(input_key)
+
+                        elif call["name"] == "batch":
+                            # Sections re-sent inside a batch are dropped the same way
+                            invocations = call["input"].get("invocations", [])
+                            fresh = []
+                            for invocation in invocations:
+                                input_key = self._input_key(invocation)
+                                if input_key not in seen_inputs:
+                                    seen_inputs.add(input_key)
+                                    fresh.append(invocation)
+
+                            if len(fresh) < len(invocations):
+                                skipped = len(invocations) - len(fresh)
+                                print(f"    Skipping {skipped} duplicate section(s) in batch")
+                                if not fresh:
+                                    local_results[call["id"]] = {
+                                        "success": True,
+                                        "message": "All sections in batch already written - skipped duplicates"
+                                    }
+                                    continue
+                                call["input"] = {**call["input"], "invocations": fresh}
+                                skipped_duplicates[call["id"]] = skipped
+
+                        if self._is_termination(call):
+                            terminations.append(call)
+                            continue
+
+                        futures[call["id"]] = serial_lane.submit(self._execute_call, call, context)
+
+                        # Progress tracking only - the executor numbers sections
+                        # itself from the context as the serial lane runs them
+                        sections_written += self._count_sections(call)
+
+                    elif event_type == "message_complete":
+                        response = event["response"]
+
+                results: Dict[str, Dict[str, Any]] = {
+                    tool_id: future.result() for tool_id, future in futures.items()
+                }
+                results.update(local_results)
+
+            if timed_out:
+                error_message = f"Iteration {iteration} exceeded its {iteration_timeout_s}s time budget"
+                print(f"  {error_message}")
+                break
+
+            # With prompt caching, input_tokens only counts tokens after the last
+            # cache breakpoint - the cached prefix (system prompt + source) is
+            # reported in the cache fields, so add those to the input total too
+            usage = response["usage"]
+            cache_creation_tokens = usage.get("cache_creation_input_tokens", 0)
+            cache_read_tokens = usage.get("cache_read_input_tokens", 0)
+            total_input_tokens += usage["input_tokens"] + cache_creation_tokens + cache_read_tokens
+            total_output_tokens += usage["output_tokens"]
+            total_cache_creation_tokens += cache_creation_tokens
+            total_cache_read_tokens += cache_read_tokens
+            context["input_tokens"] = total_input_tokens
+            context["output_tokens"] = total_output_tokens
 
             content_blocks = response.get("content_blocks", [])
             serialized_content = claude_parsing_utils.serialize_content_blocks(content_blocks)
             messages.append({"role": "assistant", "content": serialized_content})
 
-            # Process tool calls
-            tool_results = []
-
-            for block in content_blocks:
-                block_type = getattr(block, "type", None) if hasattr(block, "type") else block.get("type")
-
-                if block_type == "tool_use":
-                    tool_name = getattr(block, "name", "") if hasattr(block, "name") else block.get("name", "")
-                    tool_input = getattr(block, "input", {}) if hasattr(block, "input") else block.get("input", {})
-                    tool_id = getattr(block, "id", "") if hasattr(block, "id") else block.get("id", "")
-
-                    print(f"    Tool: {tool_name}")
-
-                    # Build execution context
-                    context = {
-                        "project_id": project_id,
-                        "job_id": job_id,
-                        "source_id": source_id,
-                        "sections_written": sections_written,
-                        "iterations": iteration,
-                        "input_tokens": total_input_tokens,
-                        "output_tokens": total_output_tokens
-                    }
-
-                    # Execute tool via executor
-                    result, is_termination = marketing_strategy_tool_executor.execute_tool(
-                        tool_name, tool_input, context
+            for call in terminations:
+                result, is_termination = marketing_strategy_tool_executor.execute_tool(
+                    call["name"], call["input"], context
+                )
+                sections_written += self._count_sections(call)
+
+                if is_termination:
+                    print(f"  Completed in {iteration} iterations, {sections_written} sections")
+                    result_usage = result.setdefault("usage", {})
+                    result_usage["cache_creation_input_tokens"] = total_cache_creation_tokens
+                    result_usage["cache_read_input_tokens"] = total_cache_read_tokens
+                    # Execution log is for debugging only - don't hold up the result
+                    persist_in_background(
+                        self._save_execution,
+                        project_id, execution_id, job_id, list(messages),
+                        result, started_at, source_id
                     )
-
-                    # Track sections written
-                    if tool_name == "write_marketing_section":
-                        sections_written += 1
-
-                    if is_termination:
-                        print(f"  Completed in {iteration} iterations, {sections_written} sections")
-                        self._save_execution(
-                            project_id, execution_id, job_id, messages,
-                            result, started_at, source_id
-                        )
-                        return result
-
-                    # Add tool result
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_id,
-                        "content": result.get("message", str(result))
-                    })
+                    return result
+
+                results[call["id"]] = result
+
+            for tool_id, skipped in skipped_duplicates.items():
+                result = results[tool_id]
+                result["message"] = (
+                    f"{result.get('message', '')}\n"
+                    f"Skipped {skipped} duplicate section(s) that were already written."
+                )
+
+            # Add tool results in the original tool_use order so IDs pair up
+            tool_results = [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": call["id"],
+                    "content": results[call["id"]].get("message", str(results[call["id"]]))
+                }
+                for call in tool_calls
+            ]
 
             if tool_results:
                 messages.append({"role": "user", "content": tool_results})
 
-        # Max iterations reached
-        print(f"  Max iterations reached ({self.MAX_ITERATIONS})")
+            # The first plan counts as progress too, so one wasted turn right
+            # after planning (e.g. a cut-off call) doesn't abort the run
+            if sections_written > sections_before or ("document_title" in context and not planned_before):
+                last_progress_iteration = iteration
+            elif iteration - last_progress_iteration >= self.MAX_STALLED_ITERATIONS:
+                error_message = f"Agent made no progress for {self.MAX_STALLED_ITERATIONS} iterations"
+                print(f"  {error_message}")
+                break
+        else:
+            print(f"  Max iterations reached ({self.MAX_ITERATIONS})")
+
+        # Max iterations reached, or stopped early by a progress/time guard
         error_result = {
             "success": False,
-            "error_message": f"Agent reached maximum iterations ({self.MAX_ITERATIONS})",
-            "iterations": self.MAX_ITERATIONS,
+            "error_message": error_message,
+            "iterations": iteration,
             "sections_written": sections_written,
-            "usage": {"input_tokens": total_input_tokens, "output_tokens": total_output_tokens}
+            "usage": {
+                "input_tokens": total_input_tokens,
+                "output_tokens": total_output_tokens,
+                "cache_creation_input_tokens": total_cache_creation_tokens,
+                "cache_read_input_tokens": total_cache_read_tokens
+            }
         }
 
-        studio_index_service.update_marketing_strategy_job(
-            project_id, job_id,
-            status="error",
-            error_message=error_result["error_message"]
-        )
+        # Writes the partial document and the error status (with any pending
+        # progress) in one job update
+        marketing_strategy_tool_executor.close_run(context, error_message=error_result["error_message"])
 
-        self._save_execution(
-            project_id, execution_id, job_id, messages,
+        persist_in_background(
+            self._save_execution,
+            project_id, execution_id, job_id, list(messages),
             error_result, started_at, source_id
         )
 
         return error_result
 
+    async def agenerate_marketing_strategy(
+        self,
+        project_id: str,
+        source_id: str,
+        job_id: str,
+        direction: str = "",
+        rate_limiter: Optional[RateLimiter] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of generate_marketing_strategy.
+
+        Educational Note: The agent loop is blocking (Claude HTTP calls and
+        studio index file writes), so it runs on a worker thread via
+        asyncio.to_thread. This frees the event loop so several jobs can be
+        awaited together with asyncio.gather().
+        """
+        return await asyncio.to_thread(
+            self.generate_marketing_strategy,
+            project_id, source_id, job_id, direction, rate_limiter
+        )
+
+    async def generate_marketing_strategies_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_concurrency: int = 4,
+        rpm: Optional[int] = None
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Run several marketing strategy agents concurrently.
+
+        Educational Note: Each job spends most of its time waiting on Claude,
+        so running jobs side by side gives throughput bounded by
+        max_concurrency instead of the sum of job latencies. The semaphore caps
+        how many agent loops run at once; the shared RateLimiter caps Claude
+        calls per minute across all of them to respect provider limits.
+
+        Args:
+            jobs: List of dicts with generate_marketing_strategy keyword
+                arguments (project_id, source_id, job_id, optional direction)
+            max_concurrency: Maximum agent loops running at the same time
+            rpm: Optional cap on Claude requests per minute across all jobs
+
+        Returns:
+            Results in job order; a failed job yields its exception instead
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        rate_limiter = RateLimiter(requests_per_minute=rpm) if rpm else None
+
+        async def run_one(job: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.agenerate_marketing_strategy(**job, rate_limiter=rate_limiter)
+
+        return await asyncio.gather(*(run_one(job) for job in jobs), return_exceptions=True)
+
+    def _is_termination(self, call: Dict[str, Any]) -> bool:
+        """Check if a tool call ends the agent loop (writes the last section)."""
+        if call["name"] == "batch":
+            return any(inv.get("is_last_section") for inv in call["input"].get("invocations", []))
+        return call["name"] == "write_marketing_section" and bool(call["input"].get("is_last_section"))
+
+    def _count_sections(self, call: Dict[str, Any]) -> int:
+        """Number of sections a tool call writes (batch writes one per invocation)."""
+        if call["name"] == "batch":
+            return len(call["input"].get("invocations", []))
+        return 1 if call["name"] == "write_marketing_section" else 0
+
+    @staticmethod
+    def _input_key(tool_input: Dict[str, Any]) -> str:
+        """Canonical hash of a tool input, used to detect repeated calls."""
+        canonical = json.dumps(tool_input, sort_keys=True).encode()
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+    def _execute_call(self, call: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single non-terminating tool call and return its result."""
+        print(f"    Tool: {call['name']}")
+        result, _ = marketing_strategy_tool_executor.execute_tool(
+            call["name"], call["input"], context
+        )
+        return result
+
     def _save_execution(
         self,
         project_id: str,
@@ -5,7 +5,8 @@ Single AI call service that uses Claude to generate Excalidraw-compatible
 element definitions for wireframe creation.
 """
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
 from app.services.integrations.claude import claude_service
@@ -20,13 +21,19 @@ from app.utils.excalidraw_utils import convert_to_excalidraw_elements
 class WireframeService:
     """Service for generating UI/UX wireframes from source content."""
 
+    MAX_SOURCE_CHARS = 12000
+
     def __init__(self):
         self._prompt_config = None
+        self._user_message_template = None
         self._tool = None
 
     def _load_config(self) -> Dict[str, Any]:
         if self._prompt_config is None:
             self._prompt_config = prompt_loader.get_prompt_config("wireframe")
+            self._user_message_template = prompt_loader.compile_message_template(
+                self._prompt_config["user_message_template"]
+            )
         return self._prompt_config
 
     def _load_tool(self) -> Dict[str, Any]:
@@ -55,6 +62,123 @@ class WireframeService:
         """
         started_at = datetime.now()
 
+        print(f"[Wireframe] Starting job {job_id}")
+
+        try:
+            source_name, request_params = self._prepare_request(
+                project_id, source_id, job_id, direction
+            )
+
+            # Call Claude with the wireframe tool
+            studio_index_service.update_wireframe_job(
+                project_id, job_id,
+                progress="Generating wireframe..."
+            )
+
+            response = claude_service.send_message(**request_params, project_id=project_id)
+
+            return self._complete_job(project_id, job_id, response, source_name, started_at)
+
+        except Exception as e:
+            return self._fail_job(project_id, job_id, e)
+
+    def generate_wireframes_batch(
+        self,
+        requests: List[Tuple[str, str, str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate many wireframes through the Message Batches API.
+
+        Educational Note: Batched requests cost 50% of the standard price but
+        complete asynchronously (minutes, up to 24 hours). This suits bulk
+        wireframe runs over many sources where no user waits on one result.
+        Each job stays in "processing" while the batch is queued.
+
+        Args:
+            requests: List of (project_id, source_id, job_id, direction) tuples
+
+        Returns:
+            List of result dicts (same shape as generate_wireframe), in request order
+        """
+        started_at = datetime.now()
+        results: Dict[str, Dict[str, Any]] = {}
+        batch_requests = []
+        prepared = {}
+
+        print(f"[Wireframe] Starting batch of {len(requests)} jobs")
+
+        # Build all user messages in one pass - failures are marked per job
+        for project_id, source_id, job_id, direction in requests:
+            try:
+                source_name, request_params = self._prepare_request(
+                    project_id, source_id, job_id, direction
+                )
+                batch_requests.append({"custom_id": job_id, "params": request_params})
+                prepared[job_id] = (project_id, source_name)
+            except Exception as e:
+                results[job_id] = self._fail_job(project_id, job_id, e)
+
+        if batch_requests:
+            try:
+                batch_id = claude_service.submit_message_batch(batch_requests)
+
+                for job_id, (project_id, _) in prepared.items():
+                    studio_index_service.update_wireframe_job(
+                        project_id, job_id,
+                        progress="Queued in batch, waiting for results..."
+                    )
+
+                responses = claude_service.poll_batch(
+                    batch_id,
+                    project_ids={job_id: project_id for job_id, (project_id, _) in prepared.items()}
+                )
+            except Exception as e:
+                responses = {job_id: {"error": str(e)} for job_id in prepared}
+
+            for job_id, (project_id, source_name) in prepared.items():
+                response = responses.get(job_id, {"error": "No result returned for batch request"})
+                try:
+                    if "error" in response:
+                        raise ValueError(response["error"])
+                    results[job_id] = self._complete_job(
+                        project_id, job_id, response, source_name, started_at
+                    )
+                except Exception as e:
+                    results[job_id] = self._fail_job(project_id, job_id, e)
+
+        return [results[job_id] for _, _, job_id, _ in requests]
+
+    async def agenerate_wireframe(
+        self,
+        project_id: str,
+        source_id: str,
+        job_id: str,
+        direction: str = "Create a wireframe for the main page layout."
+    ) -> Dict[str, Any]:
+        """
+        Async variant of generate_wireframe.
+
+        Runs the blocking generation on a worker thread so callers can await
+        several wireframes concurrently without blocking the event loop.
+        """
+        return await asyncio.to_thread(
+            self.generate_wireframe,
+            project_id, source_id, job_id, direction
+        )
+
+    def _prepare_request(
+        self,
+        project_id: str,
+        source_id: str,
+        job_id: str,
+        direction: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Load source content and build the Claude request for one wireframe job.
+
+        Returns:
+            Tuple of (source_name, send_message keyword arguments)
+        """
         # Update job to processing
         studio_index_service.update_wireframe_job(
             project_id, job_id,
@@ -63,118 +187,126 @@ class WireframeService:
             started_at=datetime.now().isoformat()
         )
 
-        print(f"[Wireframe] Starting job {job_id}")
-
-        try:
-            # Get source metadata
-            source = source_index_service.get_source_from_index(project_id, source_id)
-            if not source:
-                raise ValueError(f"Source {source_id} not found")
+        # Get source metadata
+        source = source_index_service.get_source_from_index(project_id, source_id)
+        if not source:
+            raise ValueError(f"Source {source_id} not found")
 
-            source_name = source.get("name", "Unknown")
+        source_name = source.get("name", "Unknown")
 
-            # Get source content using shared utility
-            studio_index_service.update_wireframe_job(
-                project_id, job_id,
-                progress="Analyzing content..."
-            )
-
-            content = get_source_content(project_id, source_id, max_chars=12000)
-            if not content or content.startswith("Error"):
-                raise ValueError("No content found for source")
+        # Get source content using shared utility
+        studio_index_service.update_wireframe_job(
+            project_id, job_id,
+            progress="Analyzing content..."
+        )
 
-            # Load config and tool
-            config = self._load_config()
-            tool = self._load_tool()
+        content = get_source_content(project_id, source_id, max_chars=self.MAX_SOURCE_CHARS)
+        if not content or content.startswith("Error"):
+            raise ValueError("No content found for source")
 
-            # Build the user message
-            user_message = config["user_message_template"].format(
-                direction=direction,
-                content=content[:12000]
-            )
+        # get_source_content bounds small sources itself, but sampled chunks of
+        # a large source can add up to more - only then do we need to truncate
+        if len(content) > self.MAX_SOURCE_CHARS:
+            print(f"[Wireframe] Source content is {len(content)} chars, truncating to {self.MAX_SOURCE_CHARS}")
+            content = content[:self.MAX_SOURCE_CHARS]
 
-            # Call Claude with the wireframe tool
-            studio_index_service.update_wireframe_job(
-                project_id, job_id,
-                progress="Generating wireframe..."
-            )
+        # Load config and tool
+        config = self._load_config()
+        tool = self._load_tool()
 
-            response = claude_service.send_message(
-                messages=[{"role": "user", "content": user_message}],
-                system_prompt=config["system_prompt"],
-                model=config["model"],
-                max_tokens=config["max_tokens"],
-                temperature=config["temperature"],
-                tools=[tool],
-                tool_choice={"type": "tool", "name": "generate_wireframe"},
-                project_id=project_id
-            )
+        # Build the user message
+        user_message = self._user_message_template.substitute(
+            direction=direction,
+            content=content
+        )
 
-            # Extract tool use result
-            tool_inputs_list = claude_parsing_utils.extract_tool_inputs(
-                response, "generate_wireframe"
-            )
+        request_params = {
+            "messages": [{"role": "user", "content": user_message}],
+            "system_prompt": config["system_prompt"],
+            "model": config["model"],
+            "max_tokens": config["max_tokens"],
+            "temperature": config["temperature"],
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": "generate_wireframe"},
+        }
 
-            if not tool_inputs_list or "elements" not in tool_inputs_list[0]:
-                raise ValueError("Failed to generate wireframe - no elements returned")
+        return source_name, request_params
 
-            tool_inputs = tool_inputs_list[0]
-            raw_elements = tool_inputs["elements"]
-            title = tool_inputs.get("title", "Wireframe")
-            description = tool_inputs.get("description", "")
-            canvas_width = tool_inputs.get("canvas_width", 1200)
-            canvas_height = tool_inputs.get("canvas_height", 800)
+    def _complete_job(
+        self,
+        project_id: str,
+        job_id: str,
+        response: Dict[str, Any],
+        source_name: str,
+        started_at: datetime
+    ) -> Dict[str, Any]:
+        """Convert Claude's tool output to Excalidraw elements and mark the job ready."""
+        # Extract tool use result
+        tool_inputs_list = claude_parsing_utils.extract_tool_inputs(
+            response, "generate_wireframe"
+        )
 
-            # Convert to Excalidraw format
-            studio_index_service.update_wireframe_job(
-                project_id, job_id,
-                progress="Formatting wireframe..."
-            )
+        if not tool_inputs_list or "elements" not in tool_inputs_list[0]:
+            raise ValueError("Failed to generate wireframe - no elements returned")
 
-            excalidraw_elements = convert_to_excalidraw_elements(raw_elements)
+        tool_inputs = tool_inputs_list[0]
+        raw_elements = tool_inputs["elements"]
+        title = tool_inputs.get("title", "Wireframe")
+        description = tool_inputs.get("description", "")
+        canvas_width = tool_inputs.get("canvas_width", 1200)
+        canvas_height = tool_inputs.get("canvas_height", 800)
 
-            # Calculate generation time
-            generation_time = (datetime.now() - started_at).total_seconds()
+        # Convert to Excalidraw format
+        studio_index_service.update_wireframe_job(
+            project_id, job_id,
+            progress="Formatting wireframe..."
+        )
 
-            # Update job with results
-            studio_index_service.update_wireframe_job(
-                project_id, job_id,
-                status="ready",
-                progress="Complete",
-                title=title,
-                description=description,
-                elements=excalidraw_elements,
-                canvas_width=canvas_width,
-                canvas_height=canvas_height,
-                element_count=len(excalidraw_elements),
-                generation_time_seconds=round(generation_time, 1),
-                completed_at=datetime.now().isoformat()
-            )
+        excalidraw_elements = convert_to_excalidraw_elements(raw_elements)
 
-            print(f"[Wireframe] Generated {len(excalidraw_elements)} elements in {generation_time:.1f}s")
+        # Calculate generation time
+        generation_time = (datetime.now() - started_at).total_seconds()
 
-            return {
-                "success": True,
-                "title": title,
-                "description": description,
-                "elements": excalidraw_elements,
-                "element_count": len(excalidraw_elements),
-                "source_name": source_name,
-                "generation_time": generation_time
-            }
+        # Update job to ready
+        studio_index_service.update_wireframe_job(
+            project_id, job_id,
+            status="ready",
+            progress="Complete",
+            title=title,
+            description=description,
+            elements=excalidraw_elements,
+            canvas_width=canvas_width,
+            canvas_height=canvas_height,
+            element_count=len(excalidraw_elements),
+            generation_time_seconds=round(generation_time, 1),
+            completed_at=datetime.now().isoformat()
+        )
 
-        except Exception as e:
-            print(f"[Wireframe] Error: {e}")
-            studio_index_service.update_wireframe_job(
-                project_id, job_id,
-                status="error",
-                error=str(e),
-                completed_at=datetime.now().isoformat()
-            )
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        print(f"[Wireframe] Generated {len(excalidraw_elements)} elements in {generation_time:.1f}s")
+
+        return {
+            "success": True,
+            "title": title,
+            "description": description,
+            "elements": excalidraw_elements,
+            "element_count": len(excalidraw_elements),
+            "source_name": source_name,
+            "generation_time": generation_time
+        }
+
+    def _fail_job(self, project_id: str, job_id: str, error: Exception) -> Dict[str, Any]:
+        """Mark a wireframe job as failed and return the error result."""
+        print(f"[Wireframe] Error: {error}")
+        studio_index_service.update_wireframe_job(
+            project_id, job_id,
+            status="error",
+            error=str(error),
+            completed_at=datetime.now().isoformat()
+        )
+        return {
+            "success": False,
+            "error": str(error)
+        }
 
 
 # Singleton instance
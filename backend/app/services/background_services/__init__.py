@@ -6,7 +6,9 @@ operations like async task execution, job queues, and thread pool management.
 
 Services:
 - task_service: Background task management using ThreadPoolExecutor
+- persist_executor: Fire-and-forget pool for execution logs and final job status writes
 """
 from app.services.background_services.task_service import task_service
+from app.services.background_services.persist_executor import persist_in_background
 
-__all__ = ["task_service"]
+__all__ = ["task_service", "persist_in_background"]
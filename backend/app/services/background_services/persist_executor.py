@@ -0,0 +1,47 @@
+"""
+Persist Executor - Fire-and-forget pool for persistence writes.
+
+Educational Note: Once an agent has its final result, saving the execution
+log is plain disk I/O the caller does not need to wait on. Handing it to a
+small dedicated pool lets the result return as soon as it is ready.
+
+Only use this for writes to files nothing else touches (one execution log
+per execution). Studio index updates are a read-modify-write of a shared
+studio_index.json with no lock - running them here races the caller's next
+synchronous index write and can lose updates or leave a truncated index.
+
+The pool is separate from task_service so persistence never queues behind
+long-running generation tasks, and it is drained on interpreter exit so
+pending writes are not lost.
+"""
+import atexit
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-persist")
+
+# Let pending writes finish before the process exits
+atexit.register(_executor.shutdown)
+
+
+def _report_failure(future: Future) -> None:
+    """Print errors from background writes - nobody else awaits the future."""
+    error = future.exception()
+    if error is not None:
+        print(f"[PersistExecutor] Background write failed: {error}")
+
+
+def persist_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Run a persistence call on the background pool.
+
+    Args:
+        func: Callable performing the write
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        Future for the write (callers normally don't wait on it)
+    """
+    future = _executor.submit(func, *args, **kwargs)
+    future.add_done_callback(_report_failure)
+    return future
@@ -11,7 +11,8 @@ Key Design Decisions:
 - Reusable: Can be called from main chat, subagents, RAG pipeline, etc.
 """
 import os
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Iterator, Union
 import anthropic
 
 from app.utils.cost_tracking import add_usage as add_cost_usage
@@ -50,7 +51,7 @@ class ClaudeService:
     def send_message(
         self,
         messages: List[Dict[str, Any]],
-        system_prompt: Optional[str] = None,
+        system_prompt: Optional[Union[str, List[Dict[str, Any]]]] = None,
         model: str = "claude-sonnet-4-5-20250929",
         max_tokens: int = 4096,
         temperature: float = 0.2,
@@ -70,7 +71,8 @@ class ClaudeService:
 
         Args:
             messages: List of message dicts with 'role' and 'content'
-            system_prompt: Optional system prompt for this conversation
+            system_prompt: Optional system prompt - a string, or a list of text blocks
+                (lets callers add cache_control for prompt caching)
             model: Claude model to use (default: claude-sonnet-4-5-20250929)
             max_tokens: Maximum tokens in response (default: 4096)
             temperature: Sampling temperature (default: 0.2)
@@ -93,14 +95,186 @@ class ClaudeService:
         """
         client = self._get_client()
 
-        # Build API call parameters
+        api_params = self._build_api_params(
+            messages=messages,
+            system_prompt=system_prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            tools=tools,
+            tool_choice=tool_choice,
+            extra_headers=extra_headers,
+        )
+
+        # Make API call
+        response = client.messages.create(**api_params)
+
+        return self._to_response_dict(response, project_id)
+
+    def stream_message(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Union[str, List[Dict[str, Any]]]] = None,
+        model: str = "claude-sonnet-4-5-20250929",
+        max_tokens: int = 4096,
+        temperature: float = 0.2,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        project_id: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a response from Claude as simplified typed events.
+
+        Educational Note: With streaming, each tool_use block's input arrives as
+        a series of partial JSON strings (input_json_delta). Once a block's
+        content_block_stop arrives its input is complete, so callers can start
+        executing that tool while Claude is still generating the next block.
+
+        Args:
+            Same as send_message
+
+        Yields:
+            Event dicts, in order:
+                - {"type": "content_block_start", "index", "content_block": {type, id, name}}
+                - {"type": "input_json_delta", "index", "partial_json"}
+                - {"type": "content_block_stop", "index"}
+                - {"type": "message_delta", "stop_reason"}
+                - {"type": "message_complete", "response"} - same dict as send_message returns
+        """
+        client = self._get_client()
+
+        api_params = self._build_api_params(
+            messages=messages,
+            system_prompt=system_prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            tools=tools,
+            tool_choice=tool_choice,
+            extra_headers=extra_headers,
+        )
+
+        with client.messages.stream(**api_params) as stream:
+            for event in stream:
+                if event.type == "content_block_start":
+                    block = event.content_block
+                    yield {
+                        "type": "content_block_start",
+                        "index": event.index,
+                        "content_block": {
+                            "type": block.type,
+                            "id": getattr(block, "id", None),
+                            "name": getattr(block, "name", None),
+                        },
+                    }
+
+                elif event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+                    yield {
+                        "type": "input_json_delta",
+                        "index": event.index,
+                        "partial_json": event.delta.partial_json,
+                    }
+
+                elif event.type == "content_block_stop":
+                    yield {"type": "content_block_stop", "index": event.index}
+
+                elif event.type == "message_delta":
+                    yield {"type": "message_delta", "stop_reason": event.delta.stop_reason}
+
+            final_message = stream.get_final_message()
+
+        yield {
+            "type": "message_complete",
+            "response": self._to_response_dict(final_message, project_id),
+        }
+
+    def submit_message_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """
+        Submit many independent requests through the Message Batches API.
+
+        Educational Note: Batches are processed asynchronously (usually within
+        minutes, at most 24 hours) and billed at 50% of the standard price.
+        Use them for bulk work where nobody is waiting on a single response.
+
+        Args:
+            requests: List of dicts with:
+                - custom_id: Caller-chosen ID used to match results (1-64 chars, [a-zA-Z0-9_-])
+                - params: Same keyword arguments as send_message (except project_id)
+
+        Returns:
+            The batch ID to pass to poll_batch
+        """
+        client = self._get_client()
+
+        batch = client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": request["custom_id"],
+                    "params": self._build_api_params(**request["params"]),
+                }
+                for request in requests
+            ]
+        )
+
+        return batch.id
+
+    def poll_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 10.0,
+        project_ids: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for a message batch to finish and collect its results.
+
+        Args:
+            batch_id: ID returned by submit_message_batch
+            poll_interval: Seconds between status checks
+            project_ids: Optional custom_id -> project_id map for cost tracking
+                (tracked at the standard rate, cost_tracking has no batch pricing)
+
+        Returns:
+            Dict mapping custom_id to either a send_message-style response dict
+            or {"error": "..."} for requests that did not succeed
+        """
+        client = self._get_client()
+
+        while client.messages.batches.retrieve(batch_id).processing_status != "ended":
+            time.sleep(poll_interval)
+
+        project_ids = project_ids or {}
+        results = {}
+
+        for entry in client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = self._to_response_dict(
+                    entry.result.message, project_ids.get(entry.custom_id)
+                )
+            else:
+                error = getattr(entry.result, "error", None)
+                results[entry.custom_id] = {"error": f"Batch request {entry.result.type}: {error}"}
+
+        return results
+
+    def _build_api_params(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Union[str, List[Dict[str, Any]]]] = None,
+        model: str = "claude-sonnet-4-5-20250929",
+        max_tokens: int = 4096,
+        temperature: float = 0.2,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Build Messages API parameters, adding optional fields only if provided."""
         api_params = {
             "model": model,
             "max_tokens": max_tokens,
             "messages": messages,
         }
 
-        # Add optional parameters only if provided
         if system_prompt:
             api_params["system"] = system_prompt
 
@@ -117,16 +291,22 @@ class ClaudeService:
         if extra_headers:
             api_params["extra_headers"] = extra_headers
 
-        # Make API call
-        response = client.messages.create(**api_params)
+        return api_params
+
+    def _to_response_dict(self, response: Any, project_id: Optional[str]) -> Dict[str, Any]:
+        """Track costs (if project_id provided) and convert an API message to our response dict."""
+        # Prompt caching stats (None from the API when caching isn't used)
+        cache_creation_input_tokens = getattr(response.usage, "cache_creation_input_tokens", None) or 0
+        cache_read_input_tokens = getattr(response.usage, "cache_read_input_tokens", None) or 0
 
-        # Track costs if project_id provided
         if project_id:
             add_cost_usage(
                 project_id=project_id,
                 model=response.model,
                 input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens
+                output_tokens=response.usage.output_tokens,
+                cache_creation_input_tokens=cache_creation_input_tokens,
+                cache_read_input_tokens=cache_read_input_tokens
             )
 
         # Return raw response data - all parsing happens in claude_parsing_utils
@@ -136,6 +316,8 @@ class ClaudeService:
             "usage": {
                 "input_tokens": response.usage.input_tokens,
                 "output_tokens": response.usage.output_tokens,
+                "cache_creation_input_tokens": cache_creation_input_tokens,
+                "cache_read_input_tokens": cache_read_input_tokens,
             },
             "stop_reason": response.stop_reason,
         }
@@ -143,7 +325,7 @@ class ClaudeService:
     def count_tokens(
         self,
         messages: List[Dict[str, Any]],
-        system_prompt: Optional[str] = None,
+        system_prompt: Optional[Union[str, List[Dict[str, Any]]]] = None,
         model: str = "claude-sonnet-4-5-20250929",
         tools: Optional[List[Dict[str, Any]]] = None,
     ) -> int:
@@ -7,9 +7,10 @@ Creates multiple ad variations for products based on source content.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_ad_job(
     project_id: str,
     job_id: str,
@@ -48,6 +49,7 @@ def create_ad_job(
     return job
 
 
+@locked_index_update
 def update_ad_job(
     project_id: str,
     job_id: str,
@@ -7,9 +7,10 @@ Uses ElevenLabs for text-to-speech synthesis.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_audio_job(
     project_id: str,
     job_id: str,
@@ -55,6 +56,7 @@ def create_audio_job(
     return job
 
 
+@locked_index_update
 def update_audio_job(
     project_id: str,
     job_id: str,
@@ -118,6 +120,7 @@ def list_audio_jobs(project_id: str, source_id: Optional[str] = None) -> List[Di
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_audio_job(project_id: str, job_id: str) -> bool:
     """
     Delete an audio job from the index.
@@ -8,9 +8,10 @@ The agent can generate images to embed within the blog content.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_blog_job(
     project_id: str,
     job_id: str,
@@ -73,6 +74,7 @@ def create_blog_job(
     return job
 
 
+@locked_index_update
 def update_blog_job(
     project_id: str,
     job_id: str,
@@ -137,6 +139,7 @@ def list_blog_jobs(project_id: str, source_id: Optional[str] = None) -> List[Dic
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_blog_job(project_id: str, job_id: str) -> bool:
     """
     Delete a blog job from the index.
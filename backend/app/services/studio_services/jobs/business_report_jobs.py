@@ -10,9 +10,10 @@ This job tracker handles reports that may include:
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_business_report_job(
     project_id: str,
     job_id: str,
@@ -81,6 +82,7 @@ def create_business_report_job(
     return job
 
 
+@locked_index_update
 def update_business_report_job(
     project_id: str,
     job_id: str,
@@ -145,6 +147,7 @@ def list_business_report_jobs(project_id: str, source_id: Optional[str] = None)
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_business_report_job(project_id: str, job_id: str) -> bool:
     """
     Delete a business report job from the index.
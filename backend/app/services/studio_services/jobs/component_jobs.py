@@ -7,9 +7,10 @@ Educational Note: Component jobs use AI to generate reusable UI components
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_component_job(
     project_id: str,
     job_id: str,
@@ -62,6 +63,7 @@ def create_component_job(
     return job
 
 
+@locked_index_update
 def update_component_job(
     project_id: str,
     job_id: str,
@@ -126,6 +128,7 @@ def list_component_jobs(project_id: str, source_id: Optional[str] = None) -> Lis
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_component_job(project_id: str, job_id: str) -> bool:
     """
     Delete a component job from the index.
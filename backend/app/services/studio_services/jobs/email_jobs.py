@@ -7,9 +7,10 @@ generate responsive HTML email templates with AI-generated images.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_email_job(
     project_id: str,
     job_id: str,
@@ -67,6 +68,7 @@ def create_email_job(
     return job
 
 
+@locked_index_update
 def update_email_job(
     project_id: str,
     job_id: str,
@@ -131,6 +133,7 @@ def list_email_jobs(project_id: str, source_id: Optional[str] = None) -> List[Di
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_email_job(project_id: str, job_id: str) -> bool:
     """
     Delete an email job from the index.
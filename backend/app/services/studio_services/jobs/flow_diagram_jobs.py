@@ -8,9 +8,10 @@ a custom node structure with React Flow.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_flow_diagram_job(
     project_id: str,
     job_id: str,
@@ -58,6 +59,7 @@ def create_flow_diagram_job(
     return job
 
 
+@locked_index_update
 def update_flow_diagram_job(
     project_id: str,
     job_id: str,
@@ -124,6 +126,7 @@ def list_flow_diagram_jobs(project_id: str, source_id: Optional[str] = None) ->
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_flow_diagram_job(project_id: str, job_id: str) -> bool:
     """
     Delete a flow diagram job from the index.
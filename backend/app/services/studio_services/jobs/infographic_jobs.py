@@ -7,9 +7,10 @@ source content and generate visual summaries using AI image generation.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_infographic_job(
     project_id: str,
     job_id: str,
@@ -59,6 +60,7 @@ def create_infographic_job(
     return job
 
 
+@locked_index_update
 def update_infographic_job(
     project_id: str,
     job_id: str,
@@ -125,6 +127,7 @@ def list_infographic_jobs(project_id: str, source_id: Optional[str] = None) -> L
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_infographic_job(project_id: str, job_id: str) -> bool:
     """
     Delete an infographic job from the index.
@@ -11,9 +11,10 @@ The markdown output can be rendered nicely on frontend and exported to PDF.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_marketing_strategy_job(
     project_id: str,
     job_id: str,
@@ -55,7 +56,10 @@ def create_marketing_strategy_job(
         "total_sections": 0,
         "current_section": None,
 
-        # Generated content
+        # Generated content and URLs. Contract: these are pure functions of
+        # (project_id, job_id) and are populated at plan time, before the file
+        # exists - only rely on the file once status is "ready" (the preview
+        # and download endpoints 404 until it is written).
         "markdown_file": None,
         "markdown_filename": None,
 
@@ -81,6 +85,7 @@ def create_marketing_strategy_job(
     return job
 
 
+@locked_index_update
 def update_marketing_strategy_job(
     project_id: str,
     job_id: str,
@@ -147,6 +152,7 @@ def list_marketing_strategy_jobs(project_id: str, source_id: Optional[str] = Non
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_marketing_strategy_job(project_id: str, job_id: str) -> bool:
     """
     Delete a marketing strategy job from the index.
@@ -7,9 +7,10 @@ hierarchical node structures for visual representation using React Flow.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_mind_map_job(
     project_id: str,
     job_id: str,
@@ -56,6 +57,7 @@ def create_mind_map_job(
     return job
 
 
+@locked_index_update
 def update_mind_map_job(
     project_id: str,
     job_id: str,
@@ -122,6 +124,7 @@ def list_mind_map_jobs(project_id: str, source_id: Optional[str] = None) -> List
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_mind_map_job(project_id: str, job_id: str) -> bool:
     """
     Delete a mind map job from the index.
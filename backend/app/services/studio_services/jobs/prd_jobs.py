@@ -11,9 +11,10 @@ The markdown output can be rendered nicely on frontend and exported to PDF.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_prd_job(
     project_id: str,
     job_id: str,
@@ -81,6 +82,7 @@ def create_prd_job(
     return job
 
 
+@locked_index_update
 def update_prd_job(
     project_id: str,
     job_id: str,
@@ -147,6 +149,7 @@ def list_prd_jobs(project_id: str, source_id: Optional[str] = None) -> List[Dict
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_prd_job(project_id: str, job_id: str) -> bool:
     """
     Delete a PRD job from the index.
@@ -7,9 +7,10 @@ screenshotted at 1920x1080 and exported to PPTX format using python-pptx.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_presentation_job(
     project_id: str,
     job_id: str,
@@ -82,6 +83,7 @@ def create_presentation_job(
     return job
 
 
+@locked_index_update
 def update_presentation_job(
     project_id: str,
     job_id: str,
@@ -146,6 +148,7 @@ def list_presentation_jobs(project_id: str, source_id: Optional[str] = None) ->
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_presentation_job(project_id: str, job_id: str) -> bool:
     """
     Delete a presentation job from the index.
@@ -7,9 +7,10 @@ from source content for testing knowledge retention.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_quiz_job(
     project_id: str,
     job_id: str,
@@ -56,6 +57,7 @@ def create_quiz_job(
     return job
 
 
+@locked_index_update
 def update_quiz_job(
     project_id: str,
     job_id: str,
@@ -122,6 +124,7 @@ def list_quiz_jobs(project_id: str, source_id: Optional[str] = None) -> List[Dic
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_quiz_job(project_id: str, job_id: str) -> bool:
     """
     Delete a quiz job from the index.
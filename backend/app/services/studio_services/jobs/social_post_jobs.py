@@ -7,9 +7,10 @@ content (Twitter, LinkedIn, etc.) from source materials.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_social_post_job(
     project_id: str,
     job_id: str,
@@ -53,6 +54,7 @@ def create_social_post_job(
     return job
 
 
+@locked_index_update
 def update_social_post_job(
     project_id: str,
     job_id: str,
@@ -115,6 +117,7 @@ def list_social_post_jobs(project_id: str) -> List[Dict[str, Any]]:
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_social_post_job(project_id: str, job_id: str) -> bool:
     """
     Delete a social post job from the index.
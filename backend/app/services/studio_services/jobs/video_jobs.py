@@ -7,9 +7,10 @@ to create short video clips from prompts derived from source content.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_video_job(
     project_id: str,
     job_id: str,
@@ -64,6 +65,7 @@ def create_video_job(
     return job
 
 
+@locked_index_update
 def update_video_job(
     project_id: str,
     job_id: str,
@@ -128,6 +130,7 @@ def list_video_jobs(project_id: str, source_id: Optional[str] = None) -> List[Di
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_video_job(project_id: str, job_id: str) -> bool:
     """
     Delete a video job from the index.
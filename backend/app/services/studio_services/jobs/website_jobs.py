@@ -8,9 +8,10 @@ Unlike email templates (single file), websites have multiple files created itera
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_website_job(
     project_id: str,
     job_id: str,
@@ -71,6 +72,7 @@ def create_website_job(
     save_index(project_id, index)
 
 
+@locked_index_update
 def update_website_job(
     project_id: str,
     job_id: str,
@@ -124,6 +126,7 @@ def list_website_jobs(project_id: str, source_id: Optional[str] = None) -> List[
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_website_job(project_id: str, job_id: str) -> bool:
     """
     Delete a website job from the index.
@@ -7,9 +7,10 @@ hand-drawn style UI prototypes, perfect for early-stage design.
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from app.services.studio_services.studio_index_service import load_index, save_index
+from app.services.studio_services.studio_index_service import load_index, save_index, locked_index_update
 
 
+@locked_index_update
 def create_wireframe_job(
     project_id: str,
     job_id: str,
@@ -59,6 +60,7 @@ def create_wireframe_job(
     return job
 
 
+@locked_index_update
 def update_wireframe_job(
     project_id: str,
     job_id: str,
@@ -125,6 +127,7 @@ def list_wireframe_jobs(project_id: str, source_id: Optional[str] = None) -> Lis
     return sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True)
 
 
+@locked_index_update
 def delete_wireframe_job(project_id: str, job_id: str) -> bool:
     """
     Delete a wireframe job from the index.
@@ -34,15 +34,65 @@ Architecture:
     ├── prd_jobs.py
     ├── marketing_strategy_jobs.py
     └── business_report_jobs.py
+
+Concurrency:
+    Jobs run on background threads, several of them in the same project
+    (e.g. generate_marketing_strategies_batch). Every job-module function that
+    writes the index is wrapped in @locked_index_update, which holds a
+    per-project lock across its whole load -> modify -> save, so concurrent
+    updates can't overwrite each other.
 """
-import json
+import functools
+import os
+import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any
+
+import orjson
 
 from app.utils.path_utils import get_studio_dir
 
 
+# =============================================================================
+# Per-Project Index Locks
+# =============================================================================
+
+_index_locks: Dict[str, threading.RLock] = {}
+_index_locks_guard = threading.Lock()
+
+def index_lock(project_id: str) -> threading.RLock:
+    """
+    Get the lock guarding a project's studio index.
+
+    Reentrant, because load_index can itself save (migration) and locked
+    helpers may call each other.
+    """
+    with _index_locks_guard:
+        lock = _index_locks.get(project_id)
+        if lock is None:
+            lock = _index_locks[project_id] = threading.RLock()
+        return lock
+
+
+def locked_index_update(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Run a job-module function that writes the index under its project's lock.
+
+    Educational Note: A lock taken only inside load_index() and save_index()
+    wouldn't help - two threads could both load, then both save, and the
+    first save is lost. The lock has to span the whole read-modify-write, so
+    it wraps the job functions. They all take project_id as first argument.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        project_id = kwargs["project_id"] if "project_id" in kwargs else args[0]
+        with index_lock(project_id):
+            return func(*args, **kwargs)
+    return wrapper
+
+
 # =============================================================================
 # Core Index Management Functions
 # =============================================================================
@@ -86,32 +136,35 @@ def load_index(project_id: str) -> Dict[str, Any]:
     if not index_path.exists():
         return default_index
 
-    try:
-        with open(index_path, 'r') as f:
-            data = json.load(f)
-
-            # Ensure all job arrays exist (migration for existing indexes)
-            needs_save = False
-            job_types = [
-                "audio_jobs", "ad_jobs", "flash_card_jobs", "mind_map_jobs",
-                "quiz_jobs", "social_post_jobs", "infographic_jobs", "email_jobs",
-                "website_jobs", "component_jobs", "video_jobs", "flow_diagram_jobs",
-                "wireframe_jobs", "presentation_jobs", "prd_jobs", "marketing_strategy_jobs",
-                "blog_jobs", "business_report_jobs"
-            ]
-
-            for job_type in job_types:
-                if job_type not in data:
-                    data[job_type] = []
-                    needs_save = True
-
-            # Persist the migration if we added missing keys
-            if needs_save:
-                save_index(project_id, data)
-
-            return data
-    except (json.JSONDecodeError, FileNotFoundError):
-        return default_index
+    # Reads hold the project lock too, so a missing-key migration saved here
+    # can't overwrite a concurrent writer's update
+    with index_lock(project_id):
+        try:
+            with open(index_path, 'rb') as f:
+                data = orjson.loads(f.read())
+
+                # Ensure all job arrays exist (migration for existing indexes)
+                needs_save = False
+                job_types = [
+                    "audio_jobs", "ad_jobs", "flash_card_jobs", "mind_map_jobs",
+                    "quiz_jobs", "social_post_jobs", "infographic_jobs", "email_jobs",
+                    "website_jobs", "component_jobs", "video_jobs", "flow_diagram_jobs",
+                    "wireframe_jobs", "presentation_jobs", "prd_jobs", "marketing_strategy_jobs",
+                    "blog_jobs", "business_report_jobs"
+                ]
+
+                for job_type in job_types:
+                    if job_type not in data:
+                        data[job_type] = []
+                        needs_save = True
+
+                # Persist the migration if we added missing keys
+                if needs_save:
+                    save_index(project_id, data)
+
+                return data
+        except (orjson.JSONDecodeError, FileNotFoundError):
+            return default_index
 
 
 def save_index(project_id: str, index_data: Dict[str, Any]) -> None:
@@ -120,8 +173,24 @@ def save_index(project_id: str, index_data: Dict[str, Any]) -> None:
     index_path.parent.mkdir(parents=True, exist_ok=True)
 
     index_data["last_updated"] = datetime.now().isoformat()
-    with open(index_path, 'w') as f:
-        json.dump(index_data, f, indent=2)
+
+    # Educational Note: The index is rewritten on every job update, so it sits
+    # on the hot path of every studio generation. orjson serializes straight
+    # to UTF-8 bytes several times faster than the stdlib json module.
+    payload = orjson.dumps(index_data, option=orjson.OPT_INDENT_2, default=str)
+
+    # Write to a temp file and swap it in, so a reader never sees a truncated
+    # index (which load_index would treat as empty - and a later save would
+    # then wipe every job)
+    fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix=".studio_index.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 # =============================================================================
@@ -5,18 +5,48 @@ Tool handlers extracted from component_agent_service.py for separation of concer
 Agent handles orchestration, executor handles tool-specific logic.
 """
 
-from typing import Dict, Any, Tuple
+import hashlib
+import json
+import re
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime
 from pathlib import Path
 
+from cachetools import LRUCache
+
 from app.utils.path_utils import get_studio_dir
 from app.services.studio_services import studio_index_service
 
 
+# Anything other than letters, digits, underscore, hyphen or space becomes "_".
+# \w is Unicode-aware, matching the previous str.isalnum() behaviour.
+_UNSAFE_NAME_RE = re.compile(r"[^\w\- ]")
+
+
+@lru_cache(maxsize=1024)
+def _slugify(name: str) -> str:
+    """Turn a variation name into a safe lowercase filename stem."""
+    return _UNSAFE_NAME_RE.sub("_", name).replace(" ", "_").lower()
+
+
 class ComponentToolExecutor:
     """Executes component agent tools."""
 
     TERMINATION_TOOL = "write_component_code"
+    MERGED_TOOL = "plan_and_write_components"
+    CACHE_SIZE = 512
+    MAX_WRITE_WORKERS = 16
+
+    def __init__(self):
+        # Educational Note: Retries and re-runs within a job often send the exact
+        # same tool input again. Caching successful results by
+        # (project, job, tool, input hash) skips rewriting identical HTML files
+        # and repeating identical studio index updates.
+        self._result_cache: LRUCache = LRUCache(maxsize=self.CACHE_SIZE)
+        self._cache_lock = threading.Lock()
 
     def execute_tool(
         self,
@@ -37,7 +67,30 @@ class ComponentToolExecutor:
         """
         project_id = context["project_id"]
         job_id = context["job_id"]
+        cache_key = (project_id, job_id, tool_name, self._canonical_input_key(tool_input))
+
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            print(f"      Reusing cached result for {tool_name}")
+            return cached
 
+        result, is_termination = self._run_tool(project_id, job_id, tool_name, tool_input, context)
+
+        if result.get("success"):
+            with self._cache_lock:
+                self._result_cache[cache_key] = (result, is_termination)
+
+        return result, is_termination
+
+    def _run_tool(
+        self,
+        project_id: str,
+        job_id: str,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Dispatch a tool call to its handler."""
         if tool_name == "plan_components":
             result = self._handle_plan(project_id, job_id, tool_input)
             return {"success": True, "message": result}, False
@@ -53,9 +106,54 @@ class ComponentToolExecutor:
             )
             return result, True  # Termination
 
+        elif tool_name == self.MERGED_TOOL:
+            # Fast path: plan and code arrive in one Claude turn. Store the plan
+            # first so the final job record has the category/description.
+            self._handle_plan(project_id, job_id, tool_input)
+            result = self._handle_write_code(
+                project_id=project_id,
+                job_id=job_id,
+                tool_input=tool_input,
+                iterations=context.get("iterations", 0),
+                input_tokens=context.get("input_tokens", 0),
+                output_tokens=context.get("output_tokens", 0)
+            )
+            return result, True  # Termination
+
         else:
             return {"success": False, "message": f"Unknown tool: {tool_name}"}, False
 
+    def _canonical_input_key(self, tool_input: Dict[str, Any]) -> str:
+        """Hash tool input with sorted keys so equal inputs share a cache key."""
+        canonical = json.dumps(tool_input, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _get_cached_result(self, cache_key: Tuple[str, str, str, str]) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Return a cached (result, is_termination) tuple if it is still valid.
+
+        A cached result from a tool that writes HTML (write_component_code or
+        the merged plan-and-write tool) is only reused while every file it
+        saved is still on disk - otherwise the tool runs again.
+        """
+        with self._cache_lock:
+            cached = self._result_cache.get(cache_key)
+
+        if cached is None:
+            return None
+
+        project_id, job_id, tool_name, _ = cache_key
+        result, _ = cached
+
+        if tool_name in (self.TERMINATION_TOOL, self.MERGED_TOOL):
+            component_dir = Path(get_studio_dir(project_id)) / "components" / job_id
+            if not all((component_dir / c["filename"]).exists() for c in result.get("components", [])):
+                with self._cache_lock:
+                    self._result_cache.pop(cache_key, None)
+                return None
+
+        return cached
+
     def _handle_plan(
         self,
         project_id: str,
@@ -82,6 +180,34 @@ class ComponentToolExecutor:
         variation_names = [v.get("variation_name", "Unnamed") for v in variations]
         return f"Component plan saved successfully. Category: {component_category}, Variations: {', '.join(variation_names)}"
 
+    def _save_component(
+        self,
+        project_id: str,
+        job_id: str,
+        component_dir: Path,
+        variation_name: str,
+        filename: str,
+        component: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Write one component's HTML file and return its saved-component record."""
+        html_code = component.get("html_code", "")
+        description = component.get("description", "")
+
+        # Save HTML file
+        file_path = component_dir / filename
+        with open(file_path, 'wb') as f:
+            f.write(html_code.encode('utf-8'))
+
+        print(f"      Saved: {filename}")
+
+        return {
+            "variation_name": variation_name,
+            "filename": filename,
+            "description": description,
+            "preview_url": f"/api/v1/projects/{project_id}/studio/components/{job_id}/preview/{filename}",
+            "char_count": len(html_code)
+        }
+
     def _handle_write_code(
         self,
         project_id: str,
@@ -103,33 +229,38 @@ class ComponentToolExecutor:
             component_dir = Path(studio_dir) / "components" / job_id
             component_dir.mkdir(parents=True, exist_ok=True)
 
-            # Save each component as HTML file
-            saved_components = []
+            # Create safe filenames up front. Different variation names can
+            # slugify to the same stem, so repeats get a numeric suffix - every
+            # component gets its own file and no two writes share a path.
+            variation_names: List[str] = []
+            filenames: List[str] = []
+            used_stems = set()
             for idx, component in enumerate(components):
                 variation_name = component.get("variation_name", f"Variation {idx + 1}")
-                html_code = component.get("html_code", "")
-                description = component.get("description", "")
-
-                # Create safe filename
-                safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in variation_name)
-                safe_name = safe_name.replace(' ', '_').lower()
-                filename = f"{safe_name}.html"
-
-                # Save HTML file
-                file_path = component_dir / filename
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(html_code)
-
-                print(f"      Saved: {filename}")
-
-                # Track component
-                saved_components.append({
-                    "variation_name": variation_name,
-                    "filename": filename,
-                    "description": description,
-                    "preview_url": f"/api/v1/projects/{project_id}/studio/components/{job_id}/preview/{filename}",
-                    "char_count": len(html_code)
-                })
+                stem = base_stem = _slugify(variation_name)
+                suffix = 2
+                while stem in used_stems:
+                    stem = f"{base_stem}_{suffix}"
+                    suffix += 1
+                used_stems.add(stem)
+                variation_names.append(variation_name)
+                filenames.append(f"{stem}.html")
+
+            # Save each component as HTML file - writes are independent, so they
+            # run concurrently. Results go into a pre-sized list by index to keep
+            # the planned variation order regardless of completion order.
+            saved_components: List[Dict[str, Any]] = [None] * len(components)
+            if components:
+                with ThreadPoolExecutor(max_workers=min(self.MAX_WRITE_WORKERS, len(components))) as executor:
+                    futures = {
+                        executor.submit(
+                            self._save_component, project_id, job_id, component_dir,
+                            variation_names[idx], filenames[idx], component
+                        ): idx
+                        for idx, component in enumerate(components)
+                    }
+                    for future, idx in futures.items():
+                        saved_components[idx] = future.result()
 
             # Get job info for component category
             job = studio_index_service.get_component_job(project_id, job_id)
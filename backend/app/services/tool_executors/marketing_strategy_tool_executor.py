@@ -5,17 +5,132 @@ Tool handlers extracted from marketing_strategy_agent_service.py for separation
 Agent handles orchestration, executor handles tool-specific logic.
 """
 
+import logging
 import os
-from typing import Dict, Any, Tuple
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from app.utils.path_utils import get_studio_dir
 from app.services.studio_services import studio_index_service
 
+logger = logging.getLogger(__name__)
+
+
+def _job_urls(project_id: str, job_id: str, context: Dict[str, Any]) -> Dict[str, str]:
+    """Markdown filename and API URLs for a job, built once and kept on the context."""
+    urls = context.get("_urls")
+    if urls is None:
+        base_url = f"/api/v1/projects/{project_id}/studio/marketing-strategies/{job_id}"
+        urls = context["_urls"] = {
+            "markdown_filename": f"{job_id}.md",
+            "preview_url": f"{base_url}/preview",
+            "download_url": f"{base_url}/download",
+        }
+    return urls
+
+
+class _JobUpdateCoalescer:
+    """
+    Debounces marketing strategy job updates into one index write per interval.
+
+    Educational Note: Every update_marketing_strategy_job call is a full
+    read-modify-write of studio_index.json. Progress updates (section counter,
+    status message) arrive once per section, but the frontend only polls
+    every few seconds. schedule() merges fields into a pending dict and a
+    timer writes them once after `interval` seconds; flush() writes them
+    immediately, before terminal status changes. Fields whose value matches
+    what this coalescer last wrote for the job are dropped, and a flush with
+    nothing left skips the write entirely.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self._interval = interval
+        # Held while writing so a timer flush never interleaves with a forced one
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._timers: Dict[Tuple[str, str], threading.Timer] = {}
+        self._last_written: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def schedule(self, project_id: str, job_id: str, **fields: Any) -> None:
+        """Merge fields into the job's pending update, starting the timer if idle."""
+        key = (project_id, job_id)
+        with self._lock:
+            self._pending.setdefault(key, {}).update(fields)
+            if key not in self._timers:
+                timer = threading.Timer(self._interval, self._flush_from_timer, args=key)
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+
+    def peek(self, project_id: str, job_id: str) -> Dict[str, Any]:
+        """Return a copy of the fields not yet written for a job."""
+        with self._lock:
+            return dict(self._pending.get((project_id, job_id), {}))
+
+    def cancel(self, project_id: str, job_id: str) -> Dict[str, Any]:
+        """Stop the job's timer and take its pending fields (changed ones only) without writing."""
+        key = (project_id, job_id)
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            if timer:
+                timer.cancel()
+
+            pending = self._pending.pop(key, {})
+            last_written = self._last_written.get(key, {})
+            return {k: v for k, v in pending.items() if last_written.get(k) != v}
+
+    def flush(self, project_id: str, job_id: str) -> None:
+        """Write a job's pending fields now (no-op if nothing changed)."""
+        with self._lock:
+            delta = self.cancel(project_id, job_id)
+            if delta:
+                studio_index_service.update_marketing_strategy_job(project_id, job_id, **delta)
+                self._last_written.setdefault((project_id, job_id), {}).update(delta)
+
+    def flush_with(self, project_id: str, job_id: str, **fields: Any) -> None:
+        """
+        Write pending fields merged with terminal `fields` in one update, then forget the job.
+
+        Educational Note: Flushing progress and then writing the terminal
+        status would be two back-to-back index rewrites. Merging them (the
+        terminal fields win) makes the end of a run a single write.
+        """
+        key = (project_id, job_id)
+        with self._lock:
+            try:
+                merged = {**self.cancel(project_id, job_id), **fields}
+                if merged:
+                    studio_index_service.update_marketing_strategy_job(project_id, job_id, **merged)
+            finally:
+                self._last_written.pop(key, None)
+
+    def _flush_from_timer(self, project_id: str, job_id: str) -> None:
+        try:
+            self.flush(project_id, job_id)
+        except Exception:
+            logger.exception("Error flushing marketing strategy job update")
+
+
+# Shared by the executor and the agent so all mid-run job updates go through one writer
+job_update_coalescer = _JobUpdateCoalescer()
+
 
 class MarketingStrategyToolExecutor:
     """Executes marketing strategy agent tools."""
 
+    # Buffered sections are written to disk once this many are pending
+    FLUSH_THRESHOLD = 32
+
+    # Tool name -> adapter method name. New tools register here; execute_tool
+    # looks the handler up instead of walking an if/elif chain.
+    _DISPATCH = {
+        "plan_marketing_strategy": "_dispatch_plan",
+        "write_marketing_section": "_dispatch_write",
+        "batch": "_handle_batch",
+    }
+
     def execute_tool(
         self,
         tool_name: str,
@@ -28,59 +143,124 @@ class MarketingStrategyToolExecutor:
         Args:
             tool_name: Name of the tool to execute
             tool_input: Input parameters from Claude
-            context: Execution context (project_id, job_id, sections_written, etc.)
+            context: Execution context (project_id, job_id, sections_written, etc.).
+                The agent passes the same dict for the whole run; handlers
+                keep per-run state on it (section counter, pending sections)
 
         Returns:
             Tuple of (result_dict, is_termination)
         """
+        # One clock read per tool call, shared by the file header and the job
+        # update. Assigned (not setdefault) because the context outlives the call.
+        context["_now"] = datetime.now()
+
+        handler = self._DISPATCH.get(tool_name)
+        if handler is None:
+            return {"success": False, "message": f"Unknown tool: {tool_name}"}, False
+
+        return getattr(self, handler)(tool_input, context)
+
+    def _dispatch_plan(
+        self,
+        tool_input: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Adapter for plan_marketing_strategy - never terminates."""
+        result = self._handle_plan(context["project_id"], context["job_id"], tool_input, context)
+        return {"success": True, "message": result}, False
+
+    def _dispatch_write(
+        self,
+        tool_input: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Adapter for write_marketing_section - finalizes after the last section."""
         project_id = context["project_id"]
         job_id = context["job_id"]
 
-        if tool_name == "plan_marketing_strategy":
-            result = self._handle_plan(project_id, job_id, tool_input)
-            return {"success": True, "message": result}, False
-
-        elif tool_name == "write_marketing_section":
-            sections_written = context.get("sections_written", 0)
-            result_msg, is_complete, file_path = self._handle_write_section(
-                project_id, job_id, tool_input, sections_written
+        sections_written = context.get("sections_written", 0)
+        result_msg, is_complete, file_path = self._handle_write_section(
+            project_id, job_id, tool_input, context
+        )
+        context["sections_written"] = sections_written + 1
+
+        if is_complete:
+            # Finalize and return termination result
+            final_result = self._finalize(
+                project_id=project_id,
+                job_id=job_id,
+                source_id=context.get("source_id"),
+                file_path=file_path,
+                sections_written=sections_written + 1,
+                iterations=context.get("iterations", 0),
+                input_tokens=context.get("input_tokens", 0),
+                output_tokens=context.get("output_tokens", 0),
+                context=context
             )
+            return final_result, True
 
-            if is_complete:
-                # Finalize and return termination result
-                final_result = self._finalize(
-                    project_id=project_id,
-                    job_id=job_id,
-                    source_id=context.get("source_id"),
-                    file_path=file_path,
-                    sections_written=sections_written + 1,
-                    iterations=context.get("iterations", 0),
-                    input_tokens=context.get("input_tokens", 0),
-                    output_tokens=context.get("output_tokens", 0)
-                )
-                return final_result, True
+        return {"success": True, "message": result_msg, "file_path": file_path}, False
 
-            return {"success": True, "message": result_msg, "file_path": file_path}, False
+    def _handle_batch(
+        self,
+        tool_input: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Handle the batch meta-tool: several write_marketing_section calls at once.
 
-        else:
-            return {"success": False, "message": f"Unknown tool: {tool_name}"}, False
+        Educational Note: Exposing a batch tool makes it explicit to Claude that
+        it may send many sections in one turn, saving a round-trip per section.
+        Invocations run in the given order because each one appends to the
+        markdown file and takes the next section number from the context.
+
+        Returns:
+            Tuple of (result_dict, is_termination) - terminates if any
+            invocation completes the document
+        """
+        messages = []
+
+        for invocation in tool_input.get("invocations", []):
+            result, is_termination = self.execute_tool("write_marketing_section", invocation, context)
+            if is_termination:
+                return result, True
+
+            messages.append(result.get("message", str(result)))
+
+        return {"success": True, "message": "\n".join(messages)}, False
 
     def _handle_plan(
         self,
         project_id: str,
         job_id: str,
-        tool_input: Dict[str, Any]
+        tool_input: Dict[str, Any],
+        context: Dict[str, Any]
     ) -> str:
-        """Handle plan_marketing_strategy tool call."""
+        """
+        Handle plan_marketing_strategy tool call.
+
+        The plan fields the other handlers need are also kept on the context,
+        so section writes don't re-read the job from the studio index.
+        """
         document_title = tool_input.get("document_title", "Marketing Strategy Document")
         product_name = tool_input.get("product_name", "Unknown Product")
         sections = tool_input.get("sections", [])
 
-        print(f"      Planning: {document_title} ({len(sections)} sections)")
+        context["document_title"] = document_title
+        context["product_name"] = product_name
+        context["total_sections"] = len(sections)
+
+        logger.debug("Planning: %s (%d sections)", document_title, len(sections))
 
-        # Update job with plan
-        studio_index_service.update_marketing_strategy_job(
+        # Update job with plan. The file name and URLs only depend on the job,
+        # so they are recorded once here rather than on every later update.
+        urls = _job_urls(project_id, job_id, context)
+        job_update_coalescer.schedule(
             project_id, job_id,
+            markdown_file=urls["markdown_filename"],
+            markdown_filename=urls["markdown_filename"],
+            preview_url=urls["preview_url"],
+            download_url=urls["download_url"],
             document_title=document_title,
             product_name=product_name,
             target_market=tool_input.get("target_market"),
@@ -102,18 +282,23 @@ class MarketingStrategyToolExecutor:
         project_id: str,
         job_id: str,
         tool_input: Dict[str, Any],
-        current_sections_written: int
+        context: Dict[str, Any]
     ) -> Tuple[str, bool, str]:
         """
         Handle write_marketing_section tool call.
 
-        We use our own counter (current_sections_written + 1) instead of trusting
+        We use our own counter (context sections_written + 1) instead of trusting
         the LLM's section_number to prevent duplicate sections.
 
+        Educational Note: Sections are not written to disk one by one. Each one
+        is appended to context["pending_sections"] and the buffer is written
+        with a single open() when FLUSH_THRESHOLD chunks are pending or the
+        document is finalized, instead of an open/write/close per section.
+
         Returns:
             Tuple of (result_message, is_complete, file_path)
         """
-        actual_section_number = current_sections_written + 1
+        actual_section_number = context.get("sections_written", 0) + 1
         agent_section_number = tool_input.get("section_number", actual_section_number)
 
         operation = tool_input.get("operation", "append")
@@ -123,45 +308,51 @@ class MarketingStrategyToolExecutor:
 
         # Log mismatch for debugging
         if agent_section_number != actual_section_number:
-            print(f"      Note: Agent sent section {agent_section_number}, using actual count {actual_section_number}")
+            logger.debug(
+                "Note: Agent sent section %s, using actual count %d",
+                agent_section_number, actual_section_number
+            )
 
-        print(f"      Writing section {actual_section_number}: {section_title} (is_last: {is_last_section})")
+        logger.debug(
+            "Writing section %d: %s (is_last: %s)",
+            actual_section_number, section_title, is_last_section
+        )
 
         try:
-            # Prepare output directory
-            studio_dir = get_studio_dir(project_id)
-            marketing_strategy_dir = os.path.join(studio_dir, "marketing_strategies")
-            os.makedirs(marketing_strategy_dir, exist_ok=True)
-
-            # File path
-            markdown_filename = f"{job_id}.md"
-            file_path = os.path.join(marketing_strategy_dir, markdown_filename)
-
-            # Get job info for document title and total sections
-            job = studio_index_service.get_marketing_strategy_job(project_id, job_id)
-            document_title = job.get("document_title", "Marketing Strategy Document") if job else "Marketing Strategy Document"
-            total_sections = job.get("total_sections", 0) if job else 0
-
-            # Write or append content
+            # Output directory and file path are resolved once per job
+            file_path = str(self._ensure_file_path(project_id, job_id, context))
+
+            # Document title and total sections come from the plan on the
+            # context; the job is only read when the run didn't plan (recovery)
+            if "document_title" in context:
+                document_title = context["document_title"]
+                total_sections = context.get("total_sections", 0)
+            else:
+                # The plan may still be pending in the coalescer, so overlay it
+                job = studio_index_service.get_marketing_strategy_job(project_id, job_id)
+                job = {**(job or {}), **job_update_coalescer.peek(project_id, job_id)}
+                document_title = job.get("document_title", "Marketing Strategy Document")
+                total_sections = job.get("total_sections", 0)
+
+            # Buffer write or append content
+            pending = context.setdefault("pending_sections", [])
             if operation == "write":
-                # First section - create file with title
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(f"# {document_title}\n\n")
-                    f.write(f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n")
-                    f.write("---\n\n")
-                    f.write(markdown_content)
-                    f.write("\n\n")
+                # First section - the next flush recreates the file with title
+                pending.clear()
+                context["pending_mode"] = "w"
+                header = f"# {document_title}\n\n*Generated on {context['_now'].strftime('%Y-%m-%d %H:%M')}*\n\n---\n\n"
+                pending.append(header + markdown_content + "\n\n")
             else:
                 # Subsequent sections - append
-                with open(file_path, "a", encoding="utf-8") as f:
-                    f.write(markdown_content)
-                    f.write("\n\n")
+                pending.append(markdown_content + "\n\n")
 
-            studio_index_service.update_marketing_strategy_job(
+            if len(pending) >= self.FLUSH_THRESHOLD:
+                self._flush_pending(context)
+
+            job_update_coalescer.schedule(
                 project_id, job_id,
                 sections_written=actual_section_number,
                 current_section=section_title,
-                markdown_file=markdown_filename,
                 status_message=f"Writing section {actual_section_number}/{total_sections}: {section_title}..."
             )
 
@@ -176,8 +367,12 @@ class MarketingStrategyToolExecutor:
             return result_msg, is_last_section, file_path
 
         except Exception as e:
-            error_msg = f"Error writing section {actual_section_number}: {str(e)}"
-            print(f"      {error_msg}")
+            # Traceback formatting is left to the log handler; the message
+            # text is built once for the tool result
+            logger.exception("Error writing section %d", actual_section_number)
+            error_msg = f"Error writing section {actual_section_number}: {e}"
+            job_update_coalescer.flush(project_id, job_id)
+            self._close_fd(context)
             return error_msg, False, None
 
     def _finalize(
@@ -189,47 +384,62 @@ class MarketingStrategyToolExecutor:
         sections_written: int,
         iterations: int,
         input_tokens: int,
-        output_tokens: int
+        output_tokens: int,
+        context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Finalize the marketing strategy document and update job status."""
         try:
-            # Get job info
-            job = studio_index_service.get_marketing_strategy_job(project_id, job_id)
-            document_title = job.get("document_title", "Marketing Strategy") if job else "Marketing Strategy"
-            markdown_filename = f"{job_id}.md"
+            # Write whatever sections are still buffered, then publish the file
+            self._flush_pending(context)
+            self._publish_part(context)
+
+            # Get document title (from the plan, else the stored job)
+            document_title = context.get("document_title")
+            if document_title is None:
+                job = studio_index_service.get_marketing_strategy_job(project_id, job_id)
+                document_title = job.get("document_title", "Marketing Strategy") if job else "Marketing Strategy"
+            urls = _job_urls(project_id, job_id, context)
+
+            # Update job to ready - only the fields that change here (the file
+            # name and URLs were recorded at plan time), merged with any
+            # pending progress update into a single write
+            ready_fields = {
+                "status": "ready",
+                "status_message": "Marketing strategy generated successfully!",
+                "iterations": iterations,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "completed_at": context["_now"].isoformat()
+            }
+            if "document_title" not in context:
+                # Run never planned, so the file name and URLs were never recorded
+                ready_fields.update(
+                    markdown_file=urls["markdown_filename"],
+                    markdown_filename=urls["markdown_filename"],
+                    preview_url=urls["preview_url"],
+                    download_url=urls["download_url"]
+                )
 
-            # Update job to ready
-            studio_index_service.update_marketing_strategy_job(
-                project_id, job_id,
-                status="ready",
-                status_message="Marketing strategy generated successfully!",
-                markdown_file=markdown_filename,
-                markdown_filename=markdown_filename,
-                preview_url=f"/api/v1/projects/{project_id}/studio/marketing-strategies/{job_id}/preview",
-                download_url=f"/api/v1/projects/{project_id}/studio/marketing-strategies/{job_id}/download",
-                iterations=iterations,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                completed_at=datetime.now().isoformat()
-            )
+            job_update_coalescer.flush_with(project_id, job_id, **ready_fields)
 
             return {
                 "success": True,
                 "job_id": job_id,
                 "document_title": document_title,
-                "markdown_file": markdown_filename,
-                "preview_url": f"/api/v1/projects/{project_id}/studio/marketing-strategies/{job_id}/preview",
-                "download_url": f"/api/v1/projects/{project_id}/studio/marketing-strategies/{job_id}/download",
+                "markdown_file": urls["markdown_filename"],
+                "preview_url": urls["preview_url"],
+                "download_url": urls["download_url"],
                 "sections_written": sections_written,
                 "iterations": iterations,
                 "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens}
             }
 
         except Exception as e:
-            error_msg = f"Error finalizing marketing strategy: {str(e)}"
-            print(f"      {error_msg}")
+            logger.exception("Error finalizing marketing strategy %s", job_id)
+            error_msg = f"Error finalizing marketing strategy: {e}"
 
-            studio_index_service.update_marketing_strategy_job(
+            self._close_fd(context)
+            job_update_coalescer.flush_with(
                 project_id, job_id,
                 status="error",
                 error_message=error_msg
@@ -242,6 +452,103 @@ class MarketingStrategyToolExecutor:
                 "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens}
             }
 
+    def _ensure_file_path(self, project_id: str, job_id: str, context: Dict[str, Any]) -> Path:
+        """
+        Return the job's markdown path, creating the output directory on first use.
+
+        The agent normally prepopulates marketing_strategy_path on the context
+        (and creates its directory); this only does the work when it didn't.
+        """
+        if "marketing_strategy_path" not in context:
+            marketing_strategy_path = Path(get_studio_dir(project_id)) / "marketing_strategies" / f"{job_id}.md"
+            marketing_strategy_path.parent.mkdir(parents=True, exist_ok=True)
+            context["marketing_strategy_path"] = marketing_strategy_path
+        return context["marketing_strategy_path"]
+
+    def _part_path(self, context: Dict[str, Any]) -> Path:
+        """Return the in-progress "<job_id>.md.part" path next to the final markdown file."""
+        marketing_strategy_path = context["marketing_strategy_path"]
+        return marketing_strategy_path.with_name(marketing_strategy_path.name + ".part")
+
+    def close_run(self, context: Dict[str, Any], error_message: Optional[str] = None) -> None:
+        """
+        Flush buffered sections and job updates for a run that ended without finalizing.
+
+        Called by the agent on its error paths (max iterations, stalled) so the
+        partial document is still on disk for debugging. Pending progress is
+        written together with the error status in a single job update.
+        """
+        try:
+            self._flush_pending(context)
+            self._publish_part(context)
+        except OSError:
+            logger.exception("Error flushing marketing strategy sections")
+        finally:
+            self._close_fd(context)
+
+            terminal_fields = {"status": "error", "error_message": error_message} if error_message else {}
+            job_update_coalescer.flush_with(context["project_id"], context["job_id"], **terminal_fields)
+
+    def _flush_pending(self, context: Dict[str, Any]) -> None:
+        """
+        Write all buffered markdown chunks to the job's .part file and clear the buffer.
+
+        Educational Note: Flushes go through one O_APPEND file descriptor kept
+        on the context (context["md_fd"]) for the rest of the job; a "write"
+        flush reopens it with O_TRUNC to start the file over. The buffer is
+        encoded once and handed to os.write() on the raw fd - no TextIOWrapper
+        locking or per-chunk encoding, and the GIL is released during the
+        syscall so other threads keep running.
+        """
+        pending = context.get("pending_sections")
+        if not pending:
+            return
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if context.pop("pending_mode", "a") == "w":
+            # Any earlier fd points at the file being replaced
+            self._close_fd(context)
+            flags |= os.O_TRUNC
+
+        if "md_fd" not in context:
+            context["md_fd"] = os.open(self._part_path(context), flags, 0o644)
+
+        payload = memoryview("".join(pending).encode("utf-8"))
+        while payload:
+            payload = payload[os.write(context["md_fd"], payload):]
+
+        pending.clear()
+
+    def _publish_part(self, context: Dict[str, Any]) -> None:
+        """
+        Durably move the job's .part file into place as the final markdown file.
+
+        Educational Note: Sections are written to "<job_id>.md.part" during
+        generation, so readers never see a half-written document. At the end
+        the data is fsync'd and os.replace() swaps it in atomically - the
+        .md file either doesn't exist yet or is complete.
+        """
+        part_path = self._part_path(context)
+        if not part_path.exists():
+            self._close_fd(context)
+            return
+
+        md_fd = context.pop("md_fd", None)
+        if md_fd is None:
+            md_fd = os.open(part_path, os.O_WRONLY)
+        try:
+            os.fsync(md_fd)
+        finally:
+            os.close(md_fd)
+
+        os.replace(part_path, context["marketing_strategy_path"])
+
+    def _close_fd(self, context: Dict[str, Any]) -> None:
+        """Close the job's append file descriptor, if one is open."""
+        md_fd = context.pop("md_fd", None)
+        if md_fd is not None:
+            os.close(md_fd)
+
 
 # Singleton instance
 marketing_strategy_tool_executor = MarketingStrategyToolExecutor()
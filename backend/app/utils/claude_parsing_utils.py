@@ -98,6 +98,39 @@ def get_stop_reason(response: Dict[str, Any]) -> str:
     return response.get("stop_reason", "")
 
 
+# =============================================================================
+# Block Normalization
+# =============================================================================
+
+def block_to_dict(block: Any) -> Dict[str, Any]:
+    """
+    Normalize a content block to a plain dict.
+
+    Educational Note: content_blocks are Anthropic SDK objects straight from the
+    API, or dicts once serialized (message history, logs). Checking the type
+    once per block replaces a hasattr + getattr/get pair for every field read.
+    Dict blocks are returned as-is.
+
+    Args:
+        block: Anthropic content block object or dict
+
+    Returns:
+        Dict with type, id, name, input, tool_use_id and content keys
+        (for SDK objects; missing attributes use empty defaults)
+    """
+    if isinstance(block, dict):
+        return block
+
+    return {
+        "type": block.type,
+        "id": getattr(block, "id", ""),
+        "name": getattr(block, "name", ""),
+        "input": getattr(block, "input", {}),
+        "tool_use_id": getattr(block, "tool_use_id", None),
+        "content": getattr(block, "content", None),
+    }
+
+
 # =============================================================================
 # Content Extraction
 # =============================================================================
@@ -224,18 +257,8 @@ def extract_tool_use_blocks(
     tool_blocks = []
     content_blocks = response.get("content_blocks", [])
 
-    for block in content_blocks:
-        # Handle Anthropic objects (have .type attribute)
-        if hasattr(block, 'type') and block.type == "tool_use":
-            if tool_name is None or block.name == tool_name:
-                tool_blocks.append({
-                    "id": block.id,
-                    "name": block.name,
-                    "input": block.input,
-                })
-
-        # Handle dict format (already serialized)
-        elif isinstance(block, dict) and block.get("type") == "tool_use":
+    for block in map(block_to_dict, content_blocks):
+        if block.get("type") == "tool_use":
             if tool_name is None or block.get("name") == tool_name:
                 tool_blocks.append({
                     "id": block.get("id"),
@@ -293,18 +316,8 @@ def extract_server_tool_use_blocks(
     tool_blocks = []
     content_blocks = response.get("content_blocks", [])
 
-    for block in content_blocks:
-        # Handle Anthropic objects
-        if hasattr(block, 'type') and block.type == "server_tool_use":
-            if tool_name is None or block.name == tool_name:
-                tool_blocks.append({
-                    "id": block.id,
-                    "name": block.name,
-                    "input": block.input,
-                })
-
-        # Handle dict format
-        elif isinstance(block, dict) and block.get("type") == "server_tool_use":
+    for block in map(block_to_dict, content_blocks):
+        if block.get("type") == "server_tool_use":
             if tool_name is None or block.get("name") == tool_name:
                 tool_blocks.append({
                     "id": block.get("id"),
@@ -342,15 +355,15 @@ def extract_server_tool_results(
     # Types we recognize as server tool results
     server_result_types = {"web_search_tool_result", "web_fetch_tool_result"}
 
-    for block in content_blocks:
-        block_type = getattr(block, "type", None) if hasattr(block, "type") else block.get("type")
+    for block in map(block_to_dict, content_blocks):
+        block_type = block.get("type")
 
         if block_type in server_result_types:
             if result_type is None or block_type == result_type:
                 result_blocks.append({
                     "type": block_type,
-                    "tool_use_id": getattr(block, "tool_use_id", None) if hasattr(block, "tool_use_id") else block.get("tool_use_id"),
-                    "content": getattr(block, "content", None) if hasattr(block, "content") else block.get("content"),
+                    "tool_use_id": block.get("tool_use_id"),
+                    "content": block.get("content"),
                 })
 
     return result_blocks
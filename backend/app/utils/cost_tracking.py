@@ -7,6 +7,10 @@ Costs are stored cumulatively in project.json and updated after each API call.
 Pricing (per 1M tokens):
 - Sonnet: $3 input, $15 output
 - Haiku: $1 input, $5 output
+
+Prompt caching: tokens written to the cache are billed at 1.25x the input
+rate and tokens read from it at 0.1x. Both count toward a model's
+input_tokens, since the API leaves them out of its own input_tokens field.
 """
 import json
 from typing import Dict, Any, Optional
@@ -21,6 +25,10 @@ PRICING = {
     "haiku": {"input": 1.0, "output": 5.0},
 }
 
+# Prompt cache pricing, as multipliers of the input rate
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
 # Lock for thread-safe file operations
 _lock = Lock()
 
@@ -45,22 +53,32 @@ def _get_model_key(model_string: str) -> str:
         return "sonnet"
 
 
-def _calculate_cost(model_key: str, input_tokens: int, output_tokens: int) -> float:
+def _calculate_cost(
+    model_key: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0
+) -> float:
     """
     Calculate cost for a single API call.
 
     Args:
         model_key: "sonnet" or "haiku"
-        input_tokens: Number of input tokens
+        input_tokens: Number of uncached input tokens
         output_tokens: Number of output tokens
+        cache_creation_input_tokens: Input tokens written to the prompt cache
+        cache_read_input_tokens: Input tokens read from the prompt cache
 
     Returns:
         Cost in USD
     """
     pricing = PRICING.get(model_key, PRICING["sonnet"])
     input_cost = (input_tokens / 1_000_000) * pricing["input"]
+    cache_write_cost = (cache_creation_input_tokens / 1_000_000) * pricing["input"] * CACHE_WRITE_MULTIPLIER
+    cache_read_cost = (cache_read_input_tokens / 1_000_000) * pricing["input"] * CACHE_READ_MULTIPLIER
     output_cost = (output_tokens / 1_000_000) * pricing["output"]
-    return input_cost + output_cost
+    return input_cost + cache_write_cost + cache_read_cost + output_cost
 
 
 def _load_project(project_id: str) -> Optional[Dict[str, Any]]:
@@ -118,7 +136,9 @@ def add_usage(
     project_id: str,
     model: str,
     input_tokens: int,
-    output_tokens: int
+    output_tokens: int,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0
 ) -> Optional[Dict[str, Any]]:
     """
     Add API usage to project cost tracking.
@@ -129,8 +149,10 @@ def add_usage(
     Args:
         project_id: The project UUID
         model: Full model string (e.g., "claude-sonnet-4-5-20250929")
-        input_tokens: Number of input tokens used
+        input_tokens: Number of uncached input tokens used
         output_tokens: Number of output tokens used
+        cache_creation_input_tokens: Input tokens written to the prompt cache
+        cache_read_input_tokens: Input tokens read from the prompt cache
 
     Returns:
         Updated cost tracking data or None if failed
@@ -146,11 +168,14 @@ def add_usage(
 
         # Get model key and calculate cost
         model_key = _get_model_key(model)
-        call_cost = _calculate_cost(model_key, input_tokens, output_tokens)
+        call_cost = _calculate_cost(
+            model_key, input_tokens, output_tokens,
+            cache_creation_input_tokens, cache_read_input_tokens
+        )
 
         # Update model-specific tracking
         model_tracking = project_data["cost_tracking"]["by_model"][model_key]
-        model_tracking["input_tokens"] += input_tokens
+        model_tracking["input_tokens"] += input_tokens + cache_creation_input_tokens + cache_read_input_tokens
         model_tracking["output_tokens"] += output_tokens
         model_tracking["cost"] += call_cost
 
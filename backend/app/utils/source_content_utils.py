@@ -6,11 +6,22 @@ with smart sampling for large sources.
 """
 
 import os
+import threading
+from pathlib import Path
 from typing import Optional
 
+from cachetools import LRUCache
+
 from app.utils.path_utils import get_sources_dir
 
 
+# Educational Note: Agents re-read the same source on retries and when several
+# studio jobs run over one source. Results are cached by the processed file's
+# mtime, so a reprocessed source gets a new key and is read fresh.
+_content_cache: LRUCache = LRUCache(maxsize=256)
+_content_cache_lock = threading.Lock()
+
+
 def get_source_content(
     project_id: str,
     source_id: str,
@@ -45,45 +56,67 @@ def get_source_content(
         if not os.path.exists(processed_path):
             return f"Source: {source.get('name', 'Unknown')}\n(Content not yet processed)"
 
-        with open(processed_path, "r", encoding="utf-8") as f:
-            full_content = f.read()
-
-        # Small source: return all
-        if len(full_content) < max_chars:
-            return full_content
-
-        # Large source: try to sample chunks
-        chunks_dir = os.path.join(sources_dir, "chunks", source_id)
-        if not os.path.exists(chunks_dir):
-            return full_content[:max_chars] + "\n\n[Content truncated...]"
-
-        chunk_files = sorted([
-            f for f in os.listdir(chunks_dir)
-            if f.endswith(".txt") and f.startswith(source_id)
-        ])
+        cache_key = (project_id, source_id, max_chars, max_chunks, os.stat(processed_path).st_mtime_ns)
 
-        if not chunk_files:
-            return full_content[:max_chars] + "\n\n[Content truncated...]"
+        with _content_cache_lock:
+            cached = _content_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Sample chunks evenly distributed
-        if len(chunk_files) <= max_chunks:
-            selected_chunks = chunk_files
-        else:
-            step = len(chunk_files) / max_chunks
-            selected_chunks = [chunk_files[int(i * step)] for i in range(max_chunks)]
+        content = _read_source_content(sources_dir, processed_path, source_id, max_chars, max_chunks)
 
-        sampled_content = []
-        for chunk_file in selected_chunks:
-            chunk_path = os.path.join(chunks_dir, chunk_file)
-            with open(chunk_path, "r", encoding="utf-8") as f:
-                sampled_content.append(f.read())
-
-        return "\n\n".join(sampled_content)
+        with _content_cache_lock:
+            _content_cache[cache_key] = content
+        return content
 
     except Exception as e:
         return f"Error loading source content: {str(e)}"
 
 
+def _read_source_content(
+    sources_dir: Path,
+    processed_path: str,
+    source_id: str,
+    max_chars: int,
+    max_chunks: int
+) -> str:
+    """Read processed content, sampling chunks evenly for large sources."""
+    with open(processed_path, "r", encoding="utf-8") as f:
+        full_content = f.read()
+
+    # Small source: return all
+    if len(full_content) < max_chars:
+        return full_content
+
+    # Large source: try to sample chunks
+    chunks_dir = os.path.join(sources_dir, "chunks", source_id)
+    if not os.path.exists(chunks_dir):
+        return full_content[:max_chars] + "\n\n[Content truncated...]"
+
+    chunk_files = sorted([
+        f for f in os.listdir(chunks_dir)
+        if f.endswith(".txt") and f.startswith(source_id)
+    ])
+
+    if not chunk_files:
+        return full_content[:max_chars] + "\n\n[Content truncated...]"
+
+    # Sample chunks evenly distributed
+    if len(chunk_files) <= max_chunks:
+        selected_chunks = chunk_files
+    else:
+        step = len(chunk_files) / max_chunks
+        selected_chunks = [chunk_files[int(i * step)] for i in range(max_chunks)]
+
+    sampled_content = []
+    for chunk_file in selected_chunks:
+        chunk_path = os.path.join(chunks_dir, chunk_file)
+        with open(chunk_path, "r", encoding="utf-8") as f:
+            sampled_content.append(f.read())
+
+    return "\n\n".join(sampled_content)
+
+
 def get_source_name(project_id: str, source_id: str) -> Optional[str]:
     """Get source name by ID."""
     try: